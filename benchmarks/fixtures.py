@@ -0,0 +1,152 @@
+"""
+Synthetic workbooks for the benchmarks.
+
+make_reference_db() writes a small Database_Code.xlsx and make_input_workbook()
+an MxLoader LOCATION template (title row, header row, four metadata rows, data
+from row 7) with a realistic mix of valid and broken rows.
+
+Usage:
+    python benchmarks/fixtures.py OUTPUT_DIR [--rows 5000]
+"""
+import argparse
+import os
+import random
+
+SHEET_NAME = "LTK-H"
+
+INPUT_HEADER = [
+    "SITEID", "LOCATION", "DESCRIPTION", "TYPE", "STATUS", "EGCOSTCENTER", "EGBA",
+    "LOCHIERARCHY.PARENT", "SYSTEMID", "ORGID", "CLASSSTRUCTUREID", "EGPLANTCODE", "EGREMARK", "LANGCODE"
+]
+
+SYSTEM_CODES = ["HAD", "HAC", "LAB", "LAC", "MKA", "MKC", "PAB", "PGB"]
+EQ_CODES = ["AA", "AP", "BB", "AN", "CP"]
+COMPONENT_CODES = ["KP", "QQ", "M", "QB"]
+
+COST_CENTERS = [
+    # Cost Center, Business Area, Plant Name, Plant Name1, Plant Unit, Plant Unit1
+    # Plant units are the unit number plus the first letter of the system code
+    ("H401010", "BA01", "LTK", "LTX", "10H,10L,10M,10P,11H,11L,11M,11P", "Common"),
+    ("H401020", "BA02", "LTK, LTY", "nan", "12H,12L,12M,12P", "20H"),
+    ("H40200", "BA03", "MMK", "MMX", "Common,10H,10L,10M,10P", "30H"),
+    ("H40300000", "BA04", "BPK", "nan", "20H,20L,20M,20P", "Common"),  # 9 digits: expected as H403000
+]
+
+
+def make_reference_db(path):
+    """Writes a Database_Code.xlsx with the sheets DataLoader.load_reference_data reads."""
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for sheet, codes in [("system_code", SYSTEM_CODES), ("eq_code", EQ_CODES), ("component_code", COMPONENT_CODES)]:
+        ws = wb.create_sheet(sheet)
+        ws.append(["code", "name"])
+        for code in codes:
+            # Loader strips and upper-cases codes
+            ws.append([f" {code.lower()} ", f"{code} description"])
+
+    ws = wb.create_sheet("cost_center")
+    ws.append(["Cost Center", "Name", "Description", "Hierachy Area", "Business Area", "Profit Center",
+               "Funcional Area", "Plant Name", "Plant Name1", "Plant Unit", "Plant Unit1"])
+    for cost_center, business_area, name, name1, unit, unit1 in COST_CENTERS:
+        ws.append([cost_center, "Name", "Description", "Area", business_area, "PC", "FA", name, name1, unit, unit1])
+
+    ws = wb.create_sheet("plant_code")
+    ws.append(["Plant", "Name", "Unit", "Remark"])
+    ws.append(["LTK", "Plant LTK", 1, "-"])
+    wb.save(path)
+
+
+def make_input_rows(n_rows, seed=0):
+    """Returns template data rows (lists matching INPUT_HEADER)."""
+    rng = random.Random(seed)
+    # Includes the Common-unit spellings of H401010 and H40300000
+    cost_centers = [c[0] for c in COST_CENTERS] + ["H40101000", "H403000", "X999"]
+    business_areas = [c[1] for c in COST_CENTERS] + ["BA09"]
+    rows, locations = [], []
+    for i in range(n_rows):
+        plant = rng.choice(["LTK", "LTK", "LTK", "MMK", "LTY", "BPK", "ZZZ"])
+        unit = rng.choice(["10", "10", "11", "12", "20", "30"])
+        system = rng.choice(SYSTEM_CODES + ["XYZ"])
+        eq = rng.choice(EQ_CODES + ["QZ"])
+        component = rng.choice(COMPONENT_CODES + ["ZZ", "", ""])
+        # KKS: unit, system + 2 digits, equipment + 3 digits, optional component
+        location = f"{plant}-{unit}{system}{rng.randint(10, 30)}{eq}{rng.randint(100, 300):03d}"
+        if component:
+            location += f"{component}{rng.randint(1, 9):02d}"
+
+        parent = None
+        roll = rng.random()
+        if locations and roll < 0.35:
+            # Child of an existing location (parent found and consistent)
+            parent = rng.choice(locations)
+            location = f"{parent}{rng.choice(COMPONENT_CODES)}{rng.randint(1, 9):02d}"
+        elif roll < 0.55:
+            parent = location[:len(location) - rng.choice([3, 5, 6])]  # Own system/equipment level
+        elif locations and roll < 0.8:
+            parent = rng.choice(locations)  # Usually not a prefix of this location
+
+        roll = rng.random()
+        if roll < 0.03:
+            location += " "  # Fails the LOCATION format check
+        elif roll < 0.05:
+            location = None
+
+        description = rng.choice([f"{location} EQUIPMENT"] * 8 + ["PUMP", "VALVE", None])
+        if rng.random() < 0.5:
+            # Matching pair from the reference table
+            cost_center, business_area = rng.choice([(c[0], c[1]) for c in COST_CENTERS])
+        else:
+            # Drawn independently so every cost center / business area mismatch occurs
+            cost_center = rng.choice(cost_centers + [None])
+            business_area = rng.choice(business_areas + [None])
+
+        row = ["SITE1", location, description, "OPERATING", "ACTIVE", cost_center, business_area, parent,
+               "PRIMARY", "EGAT", "LOC-CLASS", plant, f"Remark {i % 97}", "EN"]
+        rows.append(row)
+        if rng.random() < 0.02:
+            rows.append(list(row))  # Duplicate KKS and description
+        if rng.random() < 0.01:
+            rows.append([None] * len(INPUT_HEADER))
+        if rng.random() < 0.01:
+            rows.append(["SITE1"] + [None] * (len(INPUT_HEADER) - 1))  # Only non-validated columns filled
+        if location:
+            locations.append(location.strip())
+    return rows
+
+
+def make_input_workbook(path, n_rows, sheet_name=SHEET_NAME, seed=0):
+    """Writes an input template with n_rows generated locations."""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append(["MxLoader LOCATION template"])
+    ws.append(INPUT_HEADER)
+    for i in range(4):
+        ws.append([f"metadata row {i + 1}"])
+    for row in make_input_rows(n_rows, seed):
+        ws.append(row)
+    wb.create_sheet("Settings").append(["Other sheets are removed from the report"])
+    wb.save(path)
+
+
+def make_fixture_set(directory, n_rows, seed=0):
+    """Writes Database_Code.xlsx and an input template into directory; returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    database_code = os.path.join(directory, "Database_Code.xlsx")
+    file_input = os.path.join(directory, f"Template_{n_rows}.xlsx")
+    make_reference_db(database_code)
+    make_input_workbook(file_input, n_rows, seed=seed)
+    return file_input, database_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for path in make_fixture_set(args.output_dir, args.rows, args.seed):
+        print(path)
@@ -0,0 +1,117 @@
+"""
+Memory benchmark for loading the input sheet.
+
+Compares the old loader (pd.read_excel of all of A:N with inferred dtypes)
+with DataLoader.load_input_data (streams only the validator columns as str).
+Each mode runs in a fresh interpreter and reports the deep size of the input
+DataFrame and the peak RSS above the post-import baseline, both after loading
+and after the validation steps.
+
+Usage:
+    python benchmarks/input_memory.py [--rows 50000] [--workdir DIR]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (resource on Unix, psutil elsewhere)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 2**20
+
+
+def current_rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def load_legacy(file_input, sheet_name):
+    """The loader before column pruning: A:N with default dtypes."""
+    import pandas as pd
+    from location_validator import Config
+
+    df = pd.read_excel(file_input, sheet_name=sheet_name, header=0, usecols=Config.COLS_MAIN, skiprows=[0, 2, 3, 4, 5])
+    df["LOCATION"] = df["LOCATION"].str.strip()
+    df["DESCRIPTION"] = df["DESCRIPTION"].str.strip()
+    return df
+
+
+def run_mode(mode, file_input, database_code, sheet_name):
+    """Child process: measures one loader and prints a JSON result line."""
+    import location_validator
+
+    location_validator.warm_up()
+    refs = location_validator.DataLoader.load_reference_data(database_code)
+    baseline = current_rss_mb()
+    if mode == "legacy":
+        df = load_legacy(file_input, sheet_name)
+    else:
+        df = location_validator.DataLoader.load_input_data(file_input, sheet_name)
+    load_peak_mb = peak_rss_mb() - baseline
+    frame_mb = df.memory_usage(deep=True).sum() / 2**20
+    columns = len(df.columns)
+    location_validator.run_validation(df, refs)
+    print(json.dumps({
+        "mode": mode, "columns": columns, "frame_mb": frame_mb,
+        "load_peak_mb": load_peak_mb, "total_peak_mb": peak_rss_mb() - baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--workdir", help="Reuse/keep generated fixtures here (default: temp dir)")
+    parser.add_argument("--child", nargs=4, metavar=("MODE", "INPUT", "DB", "SHEET"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_mode(*args.child)
+        return 0
+
+    from benchmarks.fixtures import SHEET_NAME, make_fixture_set
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="location_bench_")
+    file_input = os.path.join(workdir, f"Template_{args.rows}.xlsx")
+    database_code = os.path.join(workdir, "Database_Code.xlsx")
+    if not (os.path.exists(file_input) and os.path.exists(database_code)):
+        print(f"Generating {args.rows} rows in {workdir} ...")
+        file_input, database_code = make_fixture_set(workdir, args.rows)
+
+    results = []
+    for mode in ("legacy", "pruned"):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, file_input, database_code, SHEET_NAME],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print("Peak RSS is measured above the post-import baseline")
+    print(f"{'loader':<8}{'columns':>9}{'input frame MB':>16}{'load peak MB':>14}{'load+validate peak MB':>23}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['columns']:>9}{r['frame_mb']:>16.1f}{r['load_peak_mb']:>14.1f}{r['total_peak_mb']:>23.1f}")
+    legacy, pruned = results
+    for key, label in [("load_peak_mb", "load"), ("total_peak_mb", "load+validate")]:
+        saved = legacy[key] - pruned[key]
+        print(f"Peak RSS reduction ({label}): {saved:.1f} MB ({saved / legacy[key]:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Reference oracle for the validator fast paths.
+
+LegacyValidator keeps the original row-wise implementations of process_kks,
+validate_codes, validate_cost_center and validate_parent exactly as they were
+before they were vectorized. benchmarks/validator_equivalence.py runs both
+and asserts identical output. Do not "fix" or optimize this file: its only
+job is to reproduce the old behaviour.
+"""
+import os
+import re  # noqa: F401  used by the verbatim process_kks
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from location_validator import DataLoader, Validator  # noqa: E402
+
+
+class LegacyValidator(Validator):
+    """Validator with the original row-wise stage implementations."""
+
+    @staticmethod
+    def process_kks(df):
+        """Processes KKS codes to extract System, EQ, and Component."""
+        # Plant regex logic
+        plant_list = df["LOCATION"].str.split('-', expand=True)[0].value_counts().index.tolist()
+        plant_regex = "|".join([p + "-" for p in plant_list])
+        plant_regex1 = "|".join([p for p in plant_list])
+        
+        df_clean = df.dropna(axis="index", how="all").copy()
+        
+        # Remove plant prefix
+        df_clean["LOCATION_x"] = df_clean["LOCATION"].str.replace(plant_regex, "", regex=True)
+        df_clean["LOCATION_x"] = df_clean["LOCATION_x"].str.replace(plant_regex1, "", regex=True)
+        
+        # Filter valid KKS
+        df_kks = df_clean[["LOCATION", "LOCATION_x", "DESCRIPTION"]].copy()
+        df_kks["DESCRIPTION"] = df_kks["DESCRIPTION"].str.strip()
+        df_kks["LOCATION"] = df_kks["LOCATION"].str.strip()
+        df_kks["LOCATION_x"] = df_kks["LOCATION_x"].str.strip()
+        
+        df_kks_test = df_kks.dropna().copy()
+        
+        # Remove prefix pattern (e.g. 10, 11)
+        lst = df_kks_test["LOCATION_x"].str[0:3].value_counts().index
+        filtered_lst = [x for x in lst if re.match(r"^[A-Za-z][A-Za-z0-9]{0,2}$", x)]
+        regex_pattern = "|".join(filtered_lst)
+        
+        replace_first = lambda x: re.sub(f"({regex_pattern})", "", x, count=1)
+        df_kks_test["LOCATION_y"] = df_kks_test["LOCATION_x"].apply(replace_first)
+        
+        # Extract System, EQ
+        system_eq = df_kks_test["LOCATION_y"].str.findall("[A-Z,-]+").str.join("")
+        df_kks_test["system_eq"] = system_eq
+        df_kks_test["SYSTEM"] = df_kks_test["system_eq"].str[0:3].str.upper().str.extract("([A-Z]+)", expand=False)
+        df_kks_test["EQ"] = df_kks_test["system_eq"].str[3:5].str.extract("([A-Z]+)", expand=False).str.upper()
+        
+        def extract_component(system_eq):
+            if "-" in system_eq and len(system_eq) == 7:
+                return system_eq[5:].upper()
+            else:
+                return system_eq[5:].upper()
+
+        df_kks_test["COMPONENT"] = df_kks_test["system_eq"].apply(extract_component)
+        
+        # Handle duplicates logic for DESCRIPTION_new
+        # Note: We return the dataframe BEFORE dropping duplicates if we want to track them, 
+        # but the original code drops them. We will follow the original flow.
+        
+        # Identify duplicates (for main df logic later if needed, but here we process unique KKS)
+        duplicated_indices = df_kks_test[df_kks_test.duplicated()].index
+        df_kks_test = df_kks_test.drop_duplicates()
+        
+        # Logic for DESCRIPTION_new
+        index_more = (
+            df_kks_test["DESCRIPTION"]
+            .value_counts()[df_kks_test["DESCRIPTION"].value_counts() > 1]
+            .index
+        )
+        df_kks_test["DESCRIPTION_new"] = ""
+        for des in index_more:
+            df_sub = df_kks_test[df_kks_test["DESCRIPTION"] == des].copy()
+            df_sub["DESCRIPTION_new"] = df_sub["DESCRIPTION"] + "_" + df_sub["LOCATION_x"]
+            df_kks_test.loc[df_sub.index, "DESCRIPTION_new"] = df_sub["DESCRIPTION_new"]
+            
+        return df_kks_test, duplicated_indices
+
+    @staticmethod
+    def validate_codes(df_main, df_kks_test, refs):
+        """Validates System, EQ, and Component codes."""
+        import pandas as pd
+
+        # Map KKS data back to main df
+        df_main["SYSTEM"] = df_kks_test["SYSTEM"]
+        df_main["EQ"] = df_kks_test["EQ"]
+        df_main["COMPONENT"] = df_kks_test["COMPONENT"]
+        
+        def check_code(row, col, ref_df):
+            val = row.get(col)
+            if pd.isna(val) or val == "":
+                return ""
+            return "มี" if val in ref_df["code"].values else "ไม่มี"
+
+        df_main["SYSTEM_STATUS"] = df_kks_test.apply(lambda r: check_code(r, "SYSTEM", refs['sys']), axis=1)
+        df_main["EQ_STATUS"] = df_kks_test.apply(lambda r: check_code(r, "EQ", refs['eq']), axis=1)
+        df_main["COMPONENT_STATUS"] = df_kks_test.apply(lambda r: check_code(r, "COMPONENT", refs['com']), axis=1)
+        return df_main
+
+    @staticmethod
+    def validate_cost_center(df_original, df_cost_ref):
+        """Validates cost center logic."""
+        import pandas as pd
+
+        # Prepare working dataframe
+        df1 = df_original.dropna(axis="index", how="all")
+        df_cost = df1[["LOCATION", "EGCOSTCENTER", "EGBA", "LOCHIERARCHY.PARENT"]].copy()
+        
+        # Determine Plant Unit
+        plant_list = df_original["LOCATION"].str.split('-', expand=True)[0].value_counts().index.tolist()
+        plant_unit = len(plant_list[0]) if plant_list else 3
+        
+        plant_regex = "|".join([p + "-" for p in plant_list])
+        plant_regex1 = "|".join([p for p in plant_list])
+        df1_loc_x = df1["LOCATION"].str.replace(plant_regex, "", regex=True).str.replace(plant_regex1, "", regex=True)
+        
+        df_cost["TOTAL_PLANT"] = df1_loc_x.str[:3]
+        df_cost["NUM_PLANT"] = ''
+        
+        cond1_num_plant = df_original['LOCATION'].isna()
+        cond2_num_plant = (df_cost["TOTAL_PLANT"] == '') | (df_cost["TOTAL_PLANT"].isna())
+        
+        df_cost.loc[cond1_num_plant, "NUM_PLANT"] = 'ไม่มี LOCATION'
+        df_cost.loc[cond2_num_plant, "NUM_PLANT"] = 'Common'
+        df_cost.loc[~cond2_num_plant, "NUM_PLANT"] = df_cost["TOTAL_PLANT"]
+        
+        df_cost.loc[df_cost["LOCATION"].isna(), "COST_STATUS"] = 'ไม่มี LOCATION'
+        
+        # Preprocess ref
+        df_cost_ref = DataLoader.prepare_cost_reference(df_cost_ref)
+        
+        df_cost["NUM_PLANT1"] = df_cost["NUM_PLANT"]
+        
+        # Update extracted numbers logic
+        def update_extracted_numbers(row, df_make_cost, plant_unit):
+            if plant_unit not in [2, 3, 4]:
+                raise ValueError("Invalid value for plant_unit. Only 2, 3 or 4 are allowed.")
+            
+            prefix_length = plant_unit
+            total_plant_prefix = row["LOCATION"][:prefix_length] if isinstance(row["LOCATION"], str) else ""
+            
+            cost_center_row = df_make_cost[
+                df_make_cost["Plant Name Split"].apply(lambda x: total_plant_prefix in x) |
+                df_make_cost["Plant Name1 Split"].apply(lambda x: total_plant_prefix in x)
+            ]
+            if not cost_center_row.empty:  
+                plant_unit_values = cost_center_row['Plant Unit'].dropna().astype(str).str.split(',').explode().str.strip()
+                plant_unit_values1 = cost_center_row['Plant Unit1'].dropna().astype(str).str.split(',').explode().str.strip()
+                
+                if cost_center_row["Plant Name Split"].apply(lambda x: total_plant_prefix in x).any():
+                    if row["NUM_PLANT1"] not in plant_unit_values.values:
+                        row["NUM_PLANT1"] = 'ไม่พบ Plant Unit'
+                elif cost_center_row["Plant Name1 Split"].apply(lambda x: total_plant_prefix in x).any():
+                    if row["NUM_PLANT1"] not in plant_unit_values1.values:
+                        row["NUM_PLANT1"] = 'ไม่พบ Plant Unit'
+            elif row["NUM_PLANT1"] == 'ไม่มี LOCATION':
+                return row
+            else:
+                row["NUM_PLANT1"] = 'ไม่พบ Plant Name'
+            return row
+
+        df_cost = df_cost.apply(lambda row: update_extracted_numbers(row, df_cost_ref, plant_unit), axis=1)
+        
+        if 'COST_SHOULD_BE' not in df_cost.columns:
+            df_cost['COST_SHOULD_BE'] = ''
+
+        def cost_center_check(row, df_make_cost, plant_unit):
+            if plant_unit not in [2, 3, 4]:
+                raise ValueError("Invalid value for plant_unit. Only 2, 3 or 4 are allowed.")
+            prefix_length = plant_unit
+            total_plant_prefix = row["LOCATION"][:prefix_length] if isinstance(row["LOCATION"], str) else ""
+            if pd.isna(row["LOCATION"]):
+                return 'ไม่มี LOCATION'
+            
+            matching_row = df_make_cost[
+                df_make_cost["Plant Name Split"].apply(lambda x: total_plant_prefix in x) |
+                df_make_cost["Plant Name1 Split"].apply(lambda x: total_plant_prefix in x)
+            ]
+            
+            if matching_row.empty and not pd.isna(row["LOCATION"]):
+                df_cost.at[row.name, 'COST_SHOULD_BE'] = 're_check'
+                return row["NUM_PLANT1"]
+            
+            plant_unit_values = matching_row['Plant Unit'].dropna().astype(str).str.split(',').explode().str.strip()
+            plant_unit_values1 = matching_row['Plant Unit1'].dropna().astype(str).str.split(',').explode().str.strip()
+            
+            if (total_plant_prefix in matching_row["Plant Name Split"].explode().values and
+                row['NUM_PLANT1'] in plant_unit_values.values):
+                matched_row = matching_row[matching_row.apply(lambda x: row['NUM_PLANT1'] in str(x['Plant Unit']).split(','), axis=1)]
+            elif (total_plant_prefix in matching_row["Plant Name1 Split"].explode().values and
+                row['NUM_PLANT1'] in plant_unit_values1.values):
+                matched_row = matching_row[matching_row.apply(lambda x: row['NUM_PLANT1'] in str(x['Plant Unit1']).split(','), axis=1)]
+            else:
+                matched_row = pd.DataFrame()
+            
+            if matched_row.empty and not pd.isna(row["LOCATION"]):
+                df_cost.at[row.name, 'COST_SHOULD_BE'] = 're_check'
+                return 'ไม่พบ Plant Unit'
+            elif matched_row.empty:
+                return 'ข้อผิดพลาดใหม่'
+            
+            cost_center_match = row['EGCOSTCENTER'] == matched_row.iloc[0]['Cost Center']
+            business_area_match = row['EGBA'] == matched_row.iloc[0]['Business Area']
+            
+            if not cost_center_match and not business_area_match:
+                if pd.isna(row['EGCOSTCENTER']) and pd.isna(row['EGBA']):
+                    df_cost.at[row.name, 'COST_SHOULD_BE'] = f"{matched_row.iloc[0]['Cost Center']},{matched_row.iloc[0]['Business Area']}"
+                    return 'ไม่มี EGCOSTCENTER เเละ EGBA'
+                df_cost.at[row.name, 'COST_SHOULD_BE'] = f"{matched_row.iloc[0]['Cost Center']},{matched_row.iloc[0]['Business Area']}"
+                return 'EGCOSTCENTER เเละ EGBA ไม่สอดคล้องกัน'
+            elif not cost_center_match:
+                if pd.isna(row['EGCOSTCENTER']):
+                    df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Cost Center']
+                    return 'ไม่มี EGCOSTCENTER'
+                
+                if  ('Common' in plant_unit_values.values or 
+                    'Common' in plant_unit_values1.values):
+                    cost_center = matched_row.iloc[0]['Cost Center']
+                    modified_cost_center = (cost_center + '00' if len(cost_center) == 7 
+                                            else cost_center[:-2] if len(cost_center) == 9 and cost_center.endswith('00')
+                                            else cost_center)
+                    
+                    if row['EGCOSTCENTER'] == modified_cost_center:
+                        df_cost.at[row.name, 'COST_SHOULD_BE'] = 'do_nothing'
+                        return 'OK'
+                    else:
+                        df_cost.at[row.name, 'COST_SHOULD_BE'] = modified_cost_center
+                        return 'EGCOSTCENTER ไม่สอดคล้องกัน'
+                else:
+                    df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Cost Center']
+                    return 'EGCOSTCENTER ไม่สอดคล้องกัน'
+            elif not business_area_match:
+                if pd.isna(row['EGBA']):
+                    df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Business Area']
+                    return 'ไม่มี EGBA'
+                df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Business Area']
+                return 'EGBA ไม่สอดคล้องกัน'
+            
+            df_cost.at[row.name, 'COST_SHOULD_BE'] = 'do_nothing'
+            return 'OK'
+
+        df_cost['COST_STATUS'] = df_cost.apply(lambda row: cost_center_check(row, df_cost_ref, plant_unit), axis=1)
+        return df_cost
+
+    @staticmethod
+    def validate_parent(df_original):
+        """Validates parent hierarchy."""
+        import pandas as pd
+
+        df_parent = df_original[["LOCATION", "LOCHIERARCHY.PARENT"]].copy()
+        df_parent["PARENT_STATUS"] = ''
+        
+        non_na_condition = df_parent["LOCATION"].notna() & df_parent["LOCHIERARCHY.PARENT"].notna()
+
+        df_parent.loc[non_na_condition, "PARENT_STATUS"] = df_parent.loc[non_na_condition].apply(
+            lambda row: ('OK' if df_parent["LOCATION"].eq(row["LOCHIERARCHY.PARENT"]).any() else 'ไม่พบ PARENT') 
+            if pd.notna(row["LOCATION"]) and pd.notna(row["LOCHIERARCHY.PARENT"]) and row["LOCHIERARCHY.PARENT"] in row["LOCATION"] 
+            else 'PARENT ไม่สอดคล้อง', axis=1
+        )
+
+        df_parent.loc[df_parent["LOCATION"].isna(), "PARENT_STATUS"] = 'ไม่มี LOCATION'
+        df_parent.loc[df_parent["LOCHIERARCHY.PARENT"].isna(), "PARENT_STATUS"] = 'ไม่มี PARENT'
+        
+        return df_parent["PARENT_STATUS"]
@@ -0,0 +1,111 @@
+"""
+Memory-mapped reference tables for multi-process workers.
+
+SharedReferenceData is the sharing scheme measured by
+benchmarks/shared_refs_memory.py. It lives next to that benchmark rather than
+in location_validator because the app has no multi-process validation path
+yet; move it there together with the first worker pool that uses it.
+"""
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from location_validator import DataLoader  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class SharedReferenceData:
+    """
+    Shares the cleaned reference tables with worker processes through
+    memory-mapped Arrow IPC files instead of pickling them to every worker.
+
+    The parent calls publish() once and hands the returned handle to each
+    worker, which calls attach() - typically from a ProcessPoolExecutor
+    initializer via init_worker(). Requires pyarrow.
+    """
+
+    # Large code tables are written to Arrow files and exposed zero-copy as
+    # Arrow-backed columns. The small cost/plant tables travel pickled inside the
+    # handle: their columns mix str and numbers (which Arrow can't store in one
+    # column) and the cost center rules rely on the exact values and NaN.
+    ZERO_COPY_TABLES = ("sys", "eq", "com")
+
+    _worker_refs = None
+
+    @staticmethod
+    def publish(refs, directory=None):
+        """
+        Writes the code tables to <directory>/<name>.arrow and returns the handle:
+        {name: file path} for those, {name: DataFrame} for the other tables.
+
+        The cost table is passed through DataLoader.prepare_cost_reference() here,
+        so workers get the plant name lists already split.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("Shared reference data requires pyarrow (pip install pyarrow)") from e
+        import pandas as pd
+
+        directory = directory or tempfile.mkdtemp(prefix="location_refs_")
+        handle = {}
+        for name, df in refs.items():
+            if name not in SharedReferenceData.ZERO_COPY_TABLES:
+                handle[name] = DataLoader.prepare_cost_reference(df) if name == "cost" else df
+                continue
+            path = os.path.join(directory, f"{name}.arrow")
+            # Arrow needs one type per column: store non-null cells of object columns as str
+            df = df.copy()
+            for col in df.columns[df.dtypes == object]:
+                df[col] = df[col].map(lambda x: x if isinstance(x, str) or pd.isna(x) else str(x))
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            handle[name] = path
+        written = sum(1 for name in SharedReferenceData.ZERO_COPY_TABLES if name in handle)
+        logger.info(f"Published {written} reference tables to {directory}")
+        return handle
+
+    @staticmethod
+    def attach(handle):
+        """Returns a refs dict backed by the memory-mapped files of a publish() handle."""
+        import pandas as pd
+        import pyarrow as pa
+
+        refs = {}
+        for name, value in handle.items():
+            if name not in SharedReferenceData.ZERO_COPY_TABLES:
+                refs[name] = value
+                continue
+            table = pa.ipc.open_file(pa.memory_map(value, "r")).read_all()
+            refs[name] = table.to_pandas(types_mapper=pd.ArrowDtype)
+        return refs
+
+    @staticmethod
+    def release(handle):
+        """Deletes the files of a publish() handle once no worker needs them."""
+        paths = [handle[name] for name in SharedReferenceData.ZERO_COPY_TABLES if name in handle]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        directories = {os.path.dirname(path) for path in paths}
+        for directory in directories:
+            if os.path.isdir(directory) and not os.listdir(directory):
+                os.rmdir(directory)
+
+    @staticmethod
+    def init_worker(handle):
+        """ProcessPoolExecutor initializer: attaches once per worker process."""
+        SharedReferenceData._worker_refs = SharedReferenceData.attach(handle)
+
+    @staticmethod
+    def worker_refs():
+        """Returns the refs attached by init_worker() in the current process."""
+        if SharedReferenceData._worker_refs is None:
+            raise RuntimeError("Reference data not attached; use SharedReferenceData.init_worker as the pool initializer")
+        return SharedReferenceData._worker_refs
@@ -0,0 +1,121 @@
+"""
+Memory benchmark for sharing reference data with worker processes.
+
+Compares pickling the refs dict to every worker (ProcessPoolExecutor initargs)
+against SharedReferenceData (benchmarks/shared_refs.py), where workers
+memory-map Arrow files. Reports each worker's unique memory (USS) after it has
+scanned every code table. With shared data, per-worker USS stays flat as the
+table size and worker count grow.
+
+Usage:
+    python benchmarks/shared_refs_memory.py
+    python benchmarks/shared_refs_memory.py --codes 500000 --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.shared_refs import SharedReferenceData  # noqa: E402
+
+_refs = None
+_barrier = None
+
+
+def make_refs(n_codes):
+    """Builds reference tables shaped like DataLoader.load_reference_data output."""
+    import pandas as pd
+
+    codes = pd.Series([f"C{i:07d}" for i in range(n_codes)], dtype=object)
+    refs = {key: pd.DataFrame({"code": codes, "name": codes + " description"}) for key in ("sys", "eq", "com")}
+    # Real workbooks mix numbers, strings and blanks in one column
+    refs["sys"]["name"] = pd.Series([i if i % 3 == 0 else f"S{i}" for i in range(n_codes)], dtype=object)
+    refs["cost"] = pd.DataFrame({
+        "Cost Center": ["H401010", "H401020", 401030], "Name": ["n", "n", float("nan")], "Description": ["d", "d", "d"],
+        "Hierachy Area": ["h", "h", "h"], "Business Area": ["BA01", "BA02", "BA03"], "Profit Center": ["p", "p", 1],
+        "Funcional Area": ["f", "f", "f"], "Plant Name": ["LTK", "MMK", 12], "Plant Name1": ["nan", "nan", "nan"],
+        "Plant Unit": ["10H,11H", 10, float("nan")], "Plant Unit1": ["nan", "nan", 20],
+    })
+    refs["plant"] = pd.DataFrame({"a": ["LTK", 7], "b": ["x", None], "c": [1, "2"], "d": ["y", "z"]})
+    return refs
+
+
+def unique_memory_mb():
+    """Unique set size of this process (psutil, or /proc on Linux); None if unavailable."""
+    try:
+        import psutil
+        return psutil.Process().memory_full_info().uss / 2**20
+    except ImportError:
+        pass
+    try:
+        private_kb = 0
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    private_kb += int(line.split()[1])
+        return private_kb / 1024
+    except OSError:
+        return None
+
+
+def init_pickled(refs, barrier):
+    global _refs, _barrier
+    import pyarrow  # noqa: F401  same imports in both modes for a fair baseline
+    _refs, _barrier = refs, barrier
+
+
+def init_shared(handle, barrier):
+    global _refs, _barrier
+    SharedReferenceData.init_worker(handle)
+    _refs, _barrier = SharedReferenceData.worker_refs(), barrier
+
+
+def worker_task(_):
+    # Touch every code so mapped pages are actually faulted in
+    for key in ("sys", "eq", "com"):
+        assert "missing" not in _refs[key]["code"].values
+    # Keep every worker busy until all have reported, so each task lands on its own process
+    _barrier.wait()
+    return os.getpid(), unique_memory_mb()
+
+
+def measure(mode, refs, handle, n_workers):
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    if mode == "pickle":
+        initializer, initargs = init_pickled, (refs, barrier)
+    else:
+        initializer, initargs = init_shared, (handle, barrier)
+    with ProcessPoolExecutor(n_workers, mp_context=ctx, initializer=initializer, initargs=initargs) as pool:
+        results = list(pool.map(worker_task, range(n_workers)))
+    values = [mb for _, mb in results if mb is not None]
+    return (sum(values) / len(values), sum(values)) if values else (None, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--codes", type=int, default=300000, help="Rows per system/eq/component table")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    refs = make_refs(args.codes)
+    handle = SharedReferenceData.publish(refs)
+    try:
+        print(f"{'mode':<8}{'workers':>8}{'USS/worker MB':>16}{'USS total MB':>15}")
+        for mode in ("pickle", "shared"):
+            for n_workers in args.workers:
+                per_worker, total = measure(mode, refs, handle, n_workers)
+                if per_worker is None:
+                    print("Unique memory is not measurable here (install psutil)")
+                    return 1
+                print(f"{mode:<8}{n_workers:>8}{per_worker:>16.1f}{total:>15.1f}")
+    finally:
+        SharedReferenceData.release(handle)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
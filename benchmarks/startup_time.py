@@ -0,0 +1,85 @@
+"""
+Startup-time benchmark for the GUI and validator modules.
+
+Runs a fresh interpreter with ``-X importtime`` for each target and prints a
+breakdown of the slowest imports, so heavy dependencies creeping back into
+module load time are easy to spot.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --top 15 --max-ms 150
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, code) pairs. "warm_up" shows what the background warm-up pays later.
+TARGETS = [
+    ("import location_validator", "import location_validator"),
+    ("import gui_app", "import gui_app"),
+    ("location_validator.warm_up()", "import location_validator; location_validator.warm_up()"),
+]
+
+# Modules that must not be loaded by a plain import of the app modules
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(code):
+    """Returns (returncode, [(cumulative_us, self_us, depth, module)], stderr) for one interpreter run."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            self_us, cum_us, indent, module = m.groups()
+            entries.append((int(cum_us), int(self_us), (len(indent) - 1) // 2, module))
+    return proc.returncode, entries, proc.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list per target")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Fail if a plain module import takes longer than this (warm_up is not checked)")
+    args = parser.parse_args()
+
+    failed = False
+    for label, code in TARGETS:
+        returncode, entries, stderr = run_importtime(code)
+        if returncode != 0:
+            last_line = stderr.strip().splitlines()[-1] if stderr.strip() else "unknown error"
+            print(f"== {label}: skipped ({last_line})\n")
+            continue
+
+        # Top-level entries (depth 0) sum to the total import time of the snippet
+        total_ms = sum(cum for cum, _, depth, _ in entries if depth == 0) / 1000
+        loaded = {module.split(".")[0] for _, _, _, module in entries}
+        heavy = sorted(loaded.intersection(HEAVY_MODULES))
+
+        print(f"== {label}: {total_ms:.1f} ms total, heavy modules loaded: {', '.join(heavy) or 'none'}")
+        for cum, self_us, depth, module in sorted(entries, reverse=True)[:args.top]:
+            print(f"   {cum / 1000:9.1f} ms cumulative {self_us / 1000:9.1f} ms self  {module}")
+        print()
+
+        if label.startswith("import "):
+            if heavy:
+                print(f"FAIL: {label} loads {', '.join(heavy)} at import time")
+                failed = True
+            if args.max_ms is not None and total_ms > args.max_ms:
+                print(f"FAIL: {label} took {total_ms:.1f} ms (budget {args.max_ms:.1f} ms)")
+                failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Equivalence and speed harness for the validator stages.
+
+Runs run_validation() once with the row-wise reference implementations
+(benchmarks/legacy_validator.py) and once with Validator on the same sheets,
+fails if any output column differs and reports the time and speedup of each
+stage (process_kks, validate_codes, validate_cost_center, validate_parent).
+
+Generated sheets are always run, and must produce every status value in
+REQUIRED_VALUES so that all branches of both implementations are compared. Real sheets passed with --input are
+anonymized first (descriptions become opaque tokens, duplicates preserved),
+so mismatch reports can be shared without leaking asset names.
+
+Usage:
+    python benchmarks/validator_equivalence.py [--rows 2000 10000] [--workdir DIR]
+        [--input Template.xlsx ... --db Database_Code.xlsx --sheet LTK-H] [--json results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+STAGES = ["process_kks", "validate_codes", "validate_cost_center", "validate_parent"]
+MAX_REPORTED_MISMATCHES = 10
+
+# Every value the validator can produce; a generated sheet must contain all of them,
+# otherwise "identical" says nothing about the branches that never ran. Unreachable
+# in the validator as written, so not required: COST_STATUS 'ข้อผิดพลาดใหม่' and
+# COMMENT 'kks และ description ซ้ำกับแถวอื่นๆ' (always overwritten by a later rule).
+REQUIRED_VALUES = {
+    "COST_STATUS": [
+        "OK", "ไม่มี LOCATION", "ไม่พบ Plant Name", "ไม่พบ Plant Unit",
+        "ไม่มี EGCOSTCENTER เเละ EGBA", "EGCOSTCENTER เเละ EGBA ไม่สอดคล้องกัน",
+        "ไม่มี EGCOSTCENTER", "EGCOSTCENTER ไม่สอดคล้องกัน", "ไม่มี EGBA", "EGBA ไม่สอดคล้องกัน",
+    ],
+    # Beyond the fixed values, the Common-unit spellings of the fixture cost centers
+    # H401010 (7 digits, + "00") and H40300000 (9 digits, - "00")
+    "COST_SHOULD_BE": ["", "re_check", "do_nothing", "H40101000", "H403000"],
+    "PARENT_STATUS": ["OK", "ไม่พบ PARENT", "PARENT ไม่สอดคล้อง", "ไม่มี LOCATION", "ไม่มี PARENT"],
+    "LOCATION_STATUS": ["TRUE", "FALSE"],
+    "SYSTEM_STATUS": ["มี", "ไม่มี"],
+    "EQ_STATUS": ["มี", "ไม่มี"],
+    "COMPONENT_STATUS": ["มี", "ไม่มี", ""],
+    "COMMENT": ["Ok", "description ซ้ำกันแต่ kks ไม่ซ้ำ", "ไม่พบ kks location", "ไม่พบ description"],
+    "LEVEL": [0, 1, 2],
+}
+
+
+def timed(validator, timings):
+    """Returns a subclass of validator that adds the wall time of each stage to timings."""
+    stages = {}
+    for stage in STAGES:
+        def run(*args, _impl=getattr(validator, stage), _stage=stage):
+            start = time.perf_counter()
+            try:
+                return _impl(*args)
+            finally:
+                timings[_stage] = timings.get(_stage, 0.0) + time.perf_counter() - start
+        stages[stage] = staticmethod(run)
+    return type(f"Timed{validator.__name__}", (validator,), stages)
+
+
+def anonymize(df):
+    """Replaces DESCRIPTION values with tokens, keeping duplicates and surrounding whitespace intact."""
+    tokens = {}
+
+    def token(value):
+        if not isinstance(value, str) or not value.strip():
+            return value
+        stripped = value.strip()
+        tokens.setdefault(stripped, f"DESC-{len(tokens) + 1:06d}")
+        lead = value[:len(value) - len(value.lstrip())]
+        trail = value[len(value.rstrip()):]
+        return f"{lead}{tokens[stripped]}{trail}"
+
+    df = df.copy()
+    df["DESCRIPTION"] = df["DESCRIPTION"].map(token)
+    return df
+
+
+def run(df_input, refs, validator):
+    """Validates a copy of df_input; returns (output frame, stage timings, total seconds)."""
+    from location_validator import Config, run_validation
+
+    timings = {}
+    start = time.perf_counter()
+    df = run_validation(df_input.copy(), refs, validator=timed(validator, timings))
+    total = time.perf_counter() - start
+    return df[Config.OUTPUT_COLS], timings, total
+
+
+def differing(expected, actual):
+    """Boolean frame of the cells that differ; NaN equals NaN."""
+    return ~((expected == actual) | (expected.isna() & actual.isna()))
+
+
+def missing_values(df):
+    """Returns {column: [REQUIRED_VALUES missing from df]}."""
+    missing = {}
+    for col, values in REQUIRED_VALUES.items():
+        present = set(df[col].dropna())
+        absent = [value for value in values if value not in present]
+        if absent:
+            missing[col] = absent
+    return missing
+
+
+def compare(name, df_input, refs, require_coverage=False):
+    """Runs both implementations on one sheet, prints the report and returns a result dict."""
+    from benchmarks.legacy_validator import LegacyValidator
+    from location_validator import Validator
+
+    expected, legacy_times, legacy_total = run(df_input, refs, LegacyValidator)
+    actual, fast_times, fast_total = run(df_input, refs, Validator)
+
+    differ = differing(expected, actual)
+    diff = {col: int(n) for col, n in differ.sum().items() if n}
+    print(f"\n{name}: {len(df_input)} rows")
+    print(f"{'stage':<22}{'legacy s':>10}{'fast s':>10}{'speedup':>10}")
+    for stage, legacy, fast in [(s, legacy_times[s], fast_times[s]) for s in STAGES] + [("run_validation", legacy_total, fast_total)]:
+        print(f"{stage:<22}{legacy:>10.3f}{fast:>10.3f}{legacy / fast if fast else float('inf'):>9.1f}x")
+
+    if diff:
+        print(f"MISMATCH in {', '.join(f'{col} ({n} rows)' for col, n in diff.items())}")
+        rows = expected.index[differ.any(axis=1)][:MAX_REPORTED_MISMATCHES]
+        for row in rows:
+            print(f"  row {row}: legacy={expected.loc[row, list(diff)].to_dict()} fast={actual.loc[row, list(diff)].to_dict()}")
+    else:
+        print("Outputs identical")
+
+    missing = missing_values(expected) if require_coverage else {}
+    for col, values in missing.items():
+        print(f"NOT COVERED: {col} never {', '.join(repr(v) for v in values)}")
+
+    return {
+        "sheet": name,
+        "rows": len(df_input),
+        "identical": not diff,
+        "mismatched_columns": diff,
+        "missing_values": missing,
+        "stages": {
+            stage: {"legacy_s": legacy_times[stage], "fast_s": fast_times[stage],
+                    "speedup": legacy_times[stage] / fast_times[stage] if fast_times[stage] else None}
+            for stage in STAGES
+        },
+        "total": {"legacy_s": legacy_total, "fast_s": fast_total,
+                  "speedup": legacy_total / fast_total if fast_total else None},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 10000],
+                        help="Generated sheet sizes (the row-wise stages are slow beyond ~20000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Reuse/keep generated fixtures here (default: temp dir)")
+    parser.add_argument("--input", nargs="+", default=[], help="Real input workbooks, anonymized before validation")
+    parser.add_argument("--db", help="Database_Code.xlsx for --input")
+    parser.add_argument("--sheet", help="Sheet name for --input (default: Config.SHEET_NAME)")
+    parser.add_argument("--json", help="Write the per-stage results to this file")
+    args = parser.parse_args()
+    if args.input and not args.db:
+        parser.error("--input requires --db")
+
+    import location_validator
+    from benchmarks.fixtures import SHEET_NAME, make_input_workbook, make_reference_db
+
+    results = []
+    workdir = args.workdir or tempfile.mkdtemp(prefix="location_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    database_code = os.path.join(workdir, "Database_Code.xlsx")
+    if not os.path.exists(database_code):
+        make_reference_db(database_code)
+    refs = location_validator.DataLoader.load_reference_data(database_code)
+    for n_rows in args.rows:
+        file_input = os.path.join(workdir, f"Template_{n_rows}_seed{args.seed}.xlsx")
+        if not os.path.exists(file_input):
+            print(f"Generating {n_rows} rows in {workdir} ...")
+            make_input_workbook(file_input, n_rows, seed=args.seed)
+        df = location_validator.DataLoader.load_input_data(file_input, SHEET_NAME)
+        results.append(compare(f"generated {n_rows}", df, refs, require_coverage=True))
+
+    if args.input:
+        refs = location_validator.DataLoader.load_reference_data(args.db)
+        sheet_name = args.sheet or location_validator.Config.SHEET_NAME
+        for file_input in args.input:
+            df = anonymize(location_validator.DataLoader.load_input_data(file_input, sheet_name))
+            results.append(compare(f"{os.path.basename(file_input)} [{sheet_name}, anonymized]", df, refs))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = [r["sheet"] for r in results if not r["identical"]]
+    uncovered = [r["sheet"] for r in results if r["missing_values"]]
+    if failed:
+        print(f"\nFAILED: outputs differ for {', '.join(failed)}")
+    if uncovered:
+        print(f"\nFAILED: status values missing from {', '.join(uncovered)}")
+    if failed or uncovered:
+        return 1
+    print(f"\nAll {len(results)} sheets identical, every status value covered by the generated sheets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
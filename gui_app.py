@@ -3,14 +3,16 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import threading
 import logging
+import importlib.util
 import json
 import os
 import sys
 
 import queue
 
-# Import the validator logic
-import location_validator
+# location_validator (and through it pandas/numpy/openpyxl) is imported lazily:
+# a background warm-up starts once the window is shown, and run_logic imports it
+# on demand so the window never waits for the heavy dependencies.
 
 # Configuration for the GUI
 SETTINGS_FILE = "settings.json"
@@ -20,6 +22,9 @@ GITHUB_URL = "https://github.com/naravid19/cmms-location-validator"
 ICON_PATH = "checkmark.ico"
 VERSION = "v1.0.0"
 COPYRIGHT = "Copyright © 2025 Narawit"
+# Keep in sync with location_validator.RESULT_WRITERS (not imported here to keep startup fast).
+# Parquet needs the optional pyarrow package; find_spec checks for it without importing it.
+OUTPUT_FORMATS = ["xlsx", "csv", "jsonl"] + (["parquet"] if importlib.util.find_spec("pyarrow") else [])
 
 class QueueHandler(logging.Handler):
     """This class sends log records to a queue"""
@@ -35,7 +40,7 @@ class App(ctk.CTk):
         super().__init__()
 
         self.title(APP_NAME)
-        self.geometry("700x600")
+        self.geometry("700x680")
         ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
         ctk.set_default_color_theme(THEME_COLOR)
         
@@ -83,19 +88,29 @@ class App(ctk.CTk):
         self.btn_db = ctk.CTkButton(self.main_frame, text="Browse", width=80, command=self.browse_db)
         self.btn_db.grid(row=3, column=2, padx=10, pady=10)
 
+        # Output Format
+        self.label_format = ctk.CTkLabel(self.main_frame, text="Output Format:")
+        self.label_format.grid(row=4, column=0, padx=10, pady=10, sticky="e")
+        self.option_format = ctk.CTkOptionMenu(self.main_frame, values=OUTPUT_FORMATS, width=120)
+        self.option_format.grid(row=4, column=1, padx=10, pady=10, sticky="w")
+
+        # Dry Run
+        self.check_dry_run = ctk.CTkCheckBox(self.main_frame, text="Dry run (summary only, skip Excel report)")
+        self.check_dry_run.grid(row=5, column=1, columnspan=2, padx=10, pady=(0, 10), sticky="w")
+
         # Run Button
         self.btn_run = ctk.CTkButton(self.main_frame, text="Run Validation", height=40, font=ctk.CTkFont(size=16, weight="bold"), command=self.start_validation)
-        self.btn_run.grid(row=4, column=0, columnspan=3, padx=10, pady=20, sticky="ew")
+        self.btn_run.grid(row=6, column=0, columnspan=3, padx=10, pady=20, sticky="ew")
 
         # Log Output
         self.textbox_log = ctk.CTkTextbox(self.main_frame, height=200)
-        self.textbox_log.grid(row=5, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="nsew")
+        self.textbox_log.grid(row=7, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="nsew")
         self.textbox_log.configure(state='disabled')
-        self.main_frame.grid_rowconfigure(5, weight=1)
+        self.main_frame.grid_rowconfigure(7, weight=1)
         
         # Footer Frame
         self.footer_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.footer_frame.grid(row=6, column=0, columnspan=3, sticky="ew", pady=(10, 0))
+        self.footer_frame.grid(row=8, column=0, columnspan=3, sticky="ew", pady=(10, 0))
         self.footer_frame.grid_columnconfigure(0, weight=1)
         self.footer_frame.grid_columnconfigure(2, weight=1)
 
@@ -103,6 +118,10 @@ class App(ctk.CTk):
         self.btn_github = ctk.CTkButton(self.footer_frame, text="GitHub Repo", width=100, fg_color="transparent", border_width=1, text_color=("gray10", "gray90"), command=self.open_github)
         self.btn_github.grid(row=0, column=0, sticky="w", padx=10)
 
+        # Compare two result files
+        self.btn_compare = ctk.CTkButton(self.footer_frame, text="Compare Runs", width=100, fg_color="transparent", border_width=1, text_color=("gray10", "gray90"), command=self.start_compare)
+        self.btn_compare.grid(row=0, column=1, padx=10)
+
         # Version & Copyright
         self.label_version = ctk.CTkLabel(self.footer_frame, text=f"{VERSION} | {COPYRIGHT}", font=ctk.CTkFont(size=10))
         self.label_version.grid(row=0, column=2, sticky="e", padx=10)
@@ -113,6 +132,9 @@ class App(ctk.CTk):
         # --- Load Settings ---
         self.load_settings()
 
+        # --- Warm up heavy imports once the window is on screen ---
+        self.after(500, self.start_warm_up)
+
     def setup_logging(self):
         # Create queue handler
         queue_handler = QueueHandler(self.log_queue)
@@ -128,6 +150,19 @@ class App(ctk.CTk):
         validator_logger.addHandler(queue_handler)
         validator_logger.setLevel(logging.INFO)
         
+    def start_warm_up(self):
+        """Import the validator and its dependencies in a background thread"""
+        thread = threading.Thread(target=self.warm_up, daemon=True)
+        thread.start()
+
+    def warm_up(self):
+        try:
+            import location_validator
+            location_validator.warm_up()
+        except Exception as e:
+            # Not fatal: run_logic will import (and report) again on demand
+            logging.error(f"Background warm-up failed: {e}")
+
     def check_log_queue(self):
         """Poll the queue for new log records and display them"""
         while not self.log_queue.empty():
@@ -175,6 +210,10 @@ class App(ctk.CTk):
                     self.entry_input.insert(0, settings["file_input"])
                 if "database_code" in settings:
                     self.entry_db.insert(0, settings["database_code"])
+                if settings.get("output_format") in OUTPUT_FORMATS:
+                    self.option_format.set(settings["output_format"])
+                if settings.get("dry_run"):
+                    self.check_dry_run.select()
                 
                 logging.info("Settings loaded.")
             except Exception as e:
@@ -184,7 +223,9 @@ class App(ctk.CTk):
         settings = {
             "sheet_name": self.entry_sheet.get(),
             "file_input": self.entry_input.get(),
-            "database_code": self.entry_db.get()
+            "database_code": self.entry_db.get(),
+            "output_format": self.option_format.get(),
+            "dry_run": bool(self.check_dry_run.get())
         }
         try:
             with open(SETTINGS_FILE, 'w') as f:
@@ -209,6 +250,8 @@ class App(ctk.CTk):
         sheet_name = self.entry_sheet.get()
         file_input = self.entry_input.get()
         database_code = self.entry_db.get()
+        output_format = self.option_format.get()
+        dry_run = bool(self.check_dry_run.get())
 
         if not sheet_name or not file_input or not database_code:
             messagebox.showwarning("Missing Input", "Please fill in all fields.")
@@ -232,24 +275,60 @@ class App(ctk.CTk):
         self.textbox_log.configure(state='disabled')
 
         # Run in thread
-        thread = threading.Thread(target=self.run_logic, args=(sheet_name, file_input, database_code))
+        thread = threading.Thread(target=self.run_logic, args=(sheet_name, file_input, database_code, output_format, dry_run))
         thread.start()
 
-    def run_logic(self, sheet_name, file_input, database_code):
+    def run_logic(self, sheet_name, file_input, database_code, output_format="xlsx", dry_run=False):
         try:
-            success = location_validator.main(sheet_name, file_input, database_code)
+            import location_validator
+            success = location_validator.main(sheet_name, file_input, database_code, dry_run=dry_run,
+                                              output_format=output_format)
             if success:
                 self.after(0, lambda: messagebox.showinfo("Success", "Validation completed successfully!"))
             else:
                 self.after(0, lambda: messagebox.showerror("Error", "Validation failed. Check logs for details."))
         except Exception as e:
             logging.error(f"Critical error in GUI thread: {e}")
-            self.after(0, lambda: messagebox.showerror("Critical Error", str(e)))
+            # Bind the message now: e is unbound once the except block ends
+            msg = str(e)
+            self.after(0, lambda: messagebox.showerror("Critical Error", msg))
+        finally:
+            self.after(0, self.reset_ui)
+
+    def start_compare(self):
+        result_types = [("Validation Results", "*.xlsx;*.csv;*.jsonl;*.parquet")]
+        file_old = filedialog.askopenfilename(title="Select the previous results (e.g. Location_review_*.xlsx)", filetypes=result_types)
+        if not file_old:
+            return
+        file_new = filedialog.askopenfilename(title="Select the new results", filetypes=result_types)
+        if not file_new:
+            return
+        diff_output = os.path.join(os.path.dirname(file_new), "Location_diff.xlsx")
+
+        self.btn_run.configure(state="disabled")
+        self.btn_compare.configure(state="disabled")
+        thread = threading.Thread(target=self.compare_logic, args=(file_old, file_new, diff_output))
+        thread.start()
+
+    def compare_logic(self, file_old, file_new, diff_output):
+        try:
+            import location_validator
+            success = location_validator.compare_results(file_old, file_new, diff_output=diff_output)
+            if success:
+                self.after(0, lambda: messagebox.showinfo("Success", f"Differences saved to {diff_output}"))
+            else:
+                self.after(0, lambda: messagebox.showerror("Error", "Comparison failed. Check logs for details."))
+        except Exception as e:
+            logging.error(f"Critical error in GUI thread: {e}")
+            # Bind the message now: e is unbound once the except block ends
+            msg = str(e)
+            self.after(0, lambda: messagebox.showerror("Critical Error", msg))
         finally:
             self.after(0, self.reset_ui)
 
     def reset_ui(self):
         self.btn_run.configure(state="normal", text="Run Validation")
+        self.btn_compare.configure(state="normal")
 
 if __name__ == "__main__":
     app = App()
@@ -1,11 +1,14 @@
-import pandas as pd
-import numpy as np
+import abc
+import argparse
+import contextlib
 import os
 import re
+import sys
+import time
 import logging
-import openpyxl
-from openpyxl import load_workbook
-from openpyxl.styles import Border, Side, PatternFill
+
+# pandas, numpy and openpyxl are imported inside the functions that use them so
+# that importing this module (e.g. from the GUI) stays cheap. See warm_up().
 
 # Setup logging
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,6 +22,14 @@ class Config:
     
     # Column definitions
     COLS_MAIN = "A:N"
+    # Input columns read by the validators (as str); the other template columns
+    # are only needed by ExcelReporter, which reads the workbook itself.
+    INPUT_COLS = ["LOCATION", "DESCRIPTION", "EGCOSTCENTER", "EGBA", "LOCHIERARCHY.PARENT"]
+    # Cell texts pandas treats as missing by default (read_csv na_values)
+    NA_VALUES = frozenset([
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+        "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+    ])
     COLS_KKS = "A:B"
     COLS_COST = "A:K"
     COLS_PLANT = "A:D"
@@ -30,12 +41,21 @@ class Config:
     SHEET_COST = "cost_center"
     SHEET_PLANT = "plant_code"
 
+    # Columns written to Location_review_*.xlsx (and any other result output)
+    OUTPUT_COLS = [
+        "LOCATION", "DESCRIPTION", "COMMENT", "SHOULD_BE", "LEVEL",
+        "COST_STATUS", "COST_SHOULD_BE", "PARENT_STATUS", "LOCATION_STATUS",
+        "SYSTEM", "SYSTEM_STATUS", "EQ", "EQ_STATUS", "COMPONENT", "COMPONENT_STATUS"
+    ]
+
 class DataLoader:
     """Handles loading and initial preprocessing of data."""
     
     @staticmethod
     def load_reference_data(db_path):
         """Loads reference data tables from the database excel."""
+        import pandas as pd
+
         logger.info(f"Step 1/7: Loading reference data from {db_path}")
         try:
             refs = {}
@@ -66,10 +86,18 @@ class DataLoader:
 
     @staticmethod
     def load_input_data(file_path, sheet_name):
-        """Loads the main input data."""
+        """
+        Loads the main input data.
+
+        Only the Config.INPUT_COLS columns the validators use are kept, as str
+        (blank cells NaN); the rest of the template is left to ExcelReporter.
+        """
+        import pandas as pd
+
         logger.info(f"Step 2/7: Loading input data from {file_path}")
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=0, usecols=Config.COLS_MAIN, skiprows=[0, 2, 3, 4, 5])
+            columns = DataLoader.read_sheet_columns(file_path, sheet_name, Config.INPUT_COLS)
+            df = pd.DataFrame({col: pd.Series(values, dtype=object) for col, values in columns.items()})
             df["LOCATION"] = df["LOCATION"].str.strip()
             df["DESCRIPTION"] = df["DESCRIPTION"].str.strip()
             return df
@@ -77,12 +105,129 @@ class DataLoader:
             logger.error(f"Failed to load input data: {e}")
             raise
 
+    @staticmethod
+    def read_sheet_columns(file_path, sheet_name, columns, header_row=1, skip_rows=(0, 2, 3, 4, 5)):
+        """
+        Streams the named columns of a template sheet into {column: [values]}.
+
+        Matches pd.read_excel(header=0, skiprows=[0, 2, 3, 4, 5], usecols=COLS_MAIN,
+        dtype=str) for those columns while holding only the requested cells in
+        memory. Cells are converted the way pandas does (integral floats to int,
+        then str) and Config.NA_VALUES become NaN.
+        """
+        import numpy as np
+        from openpyxl import load_workbook
+        from openpyxl.utils import range_boundaries
+
+        convert = DataLoader.convert_cell
+        max_col = range_boundaries(Config.COLS_MAIN)[2]
+        wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            ws = wb[sheet_name]
+            # Read-only sheets trust the stored dimensions, which some writers get wrong
+            ws.reset_dimensions()
+            rows = ws.iter_rows(values_only=True)
+
+            positions = None
+            data = {col: [] for col in columns}
+            n_rows = last_row_with_data = 0
+            for row_idx, row in enumerate(rows):
+                if positions is None:
+                    if row_idx != header_row:
+                        continue
+                    header = [str(value) if value is not None else "" for value in row[:max_col]]
+                    missing = [col for col in columns if col not in header]
+                    if missing:
+                        raise ValueError(f"Sheet '{sheet_name}' is missing columns: {', '.join(missing)}")
+                    positions = [(col, header.index(col)) for col in columns]
+                    continue
+                if row_idx in skip_rows:
+                    continue
+
+                for col, pos in positions:
+                    data[col].append(convert(row[pos]) if pos < len(row) else np.nan)
+                n_rows += 1
+                # Like pandas, drop trailing rows that are empty across the whole sheet width
+                if any(value is not None and value != "" for value in row):
+                    last_row_with_data = n_rows
+
+            if positions is None:
+                raise ValueError(f"Sheet '{sheet_name}' has no header row")
+            return {col: values[:last_row_with_data] for col, values in data.items()}
+        finally:
+            wb.close()
+
+    @staticmethod
+    def convert_cell(value):
+        """
+        Converts one cell value the way pd.read_excel(dtype=str) does: blanks and
+        Config.NA_VALUES to NaN, integral floats to int, everything else to str.
+        """
+        import numpy as np
+
+        if value is None or value == "" or (isinstance(value, float) and np.isnan(value)):
+            return np.nan
+        if isinstance(value, str):
+            return np.nan if value in Config.NA_VALUES else value
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
+    @staticmethod
+    def input_from_records(records):
+        """
+        Builds an input DataFrame from row dicts, cleaned like load_input_data.
+
+        Values are converted with convert_cell(), so a JSON number and the same
+        number typed into the template give the same result. Raises ValueError
+        for rows that are not dicts or hold non-scalar values.
+        """
+        import pandas as pd
+
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise ValueError(f"Row {i} is not an object of column values")
+            for col in Config.INPUT_COLS:
+                if isinstance(record.get(col), (dict, list)):
+                    raise ValueError(f"Row {i}: {col} must be a string, number or null")
+
+        df = pd.DataFrame({
+            col: pd.Series([DataLoader.convert_cell(record.get(col)) for record in records], dtype=object)
+            for col in Config.INPUT_COLS
+        })
+        df["LOCATION"] = df["LOCATION"].str.strip()
+        df["DESCRIPTION"] = df["DESCRIPTION"].str.strip()
+        return df
+
+    @staticmethod
+    def prepare_cost_reference(df_cost_ref):
+        """
+        Returns a copy of the cost center table with the plant name lists split out.
+
+        A table that is already prepared is returned as is, so long-running callers
+        can prepare it once and share it between validations.
+        """
+        if "Plant Name Split" in df_cost_ref.columns:
+            return df_cost_ref
+
+        def split_names(x):
+            return [name.strip() for name in x.split(',')] if ',' in x else [x.strip()]
+
+        df_cost_ref = df_cost_ref.copy()
+        df_cost_ref["Plant Name"] = df_cost_ref["Plant Name"].astype(str)
+        df_cost_ref["Plant Name1"] = df_cost_ref["Plant Name1"].astype(str)
+        df_cost_ref["Plant Name Split"] = df_cost_ref["Plant Name"].apply(split_names)
+        df_cost_ref["Plant Name1 Split"] = df_cost_ref["Plant Name1"].apply(split_names)
+        return df_cost_ref
+
 class Validator:
     """Contains validation logic for Location, Codes, and Cost Centers."""
 
     @staticmethod
     def validate_location_format(df):
         """Checks if LOCATION matches its stripped version."""
+        import numpy as np
+
         df_loc = df[["LOCATION"]].copy()
         df_loc["LOCATION_STRIP"] = (
             df_loc["LOCATION"]
@@ -116,72 +261,57 @@ class Validator:
         
         df_kks_test = df_kks.dropna().copy()
         
-        # Remove prefix pattern (e.g. 10, 11)
+        # Remove prefix pattern (e.g. 10, 11), first occurrence only
         lst = df_kks_test["LOCATION_x"].str[0:3].value_counts().index
         filtered_lst = [x for x in lst if re.match(r"^[A-Za-z][A-Za-z0-9]{0,2}$", x)]
         regex_pattern = "|".join(filtered_lst)
-        
-        replace_first = lambda x: re.sub(f"({regex_pattern})", "", x, count=1)
-        df_kks_test["LOCATION_y"] = df_kks_test["LOCATION_x"].apply(replace_first)
+        df_kks_test["LOCATION_y"] = df_kks_test["LOCATION_x"].str.replace(f"({regex_pattern})", "", n=1, regex=True)
         
         # Extract System, EQ
         system_eq = df_kks_test["LOCATION_y"].str.findall("[A-Z,-]+").str.join("")
         df_kks_test["system_eq"] = system_eq
         df_kks_test["SYSTEM"] = df_kks_test["system_eq"].str[0:3].str.upper().str.extract("([A-Z]+)", expand=False)
         df_kks_test["EQ"] = df_kks_test["system_eq"].str[3:5].str.extract("([A-Z]+)", expand=False).str.upper()
+        df_kks_test["COMPONENT"] = df_kks_test["system_eq"].str[5:].str.upper()
         
-        def extract_component(system_eq):
-            if "-" in system_eq and len(system_eq) == 7:
-                return system_eq[5:].upper()
-            else:
-                return system_eq[5:].upper()
-
-        df_kks_test["COMPONENT"] = df_kks_test["system_eq"].apply(extract_component)
-        
-        # Handle duplicates logic for DESCRIPTION_new
-        # Note: We return the dataframe BEFORE dropping duplicates if we want to track them, 
-        # but the original code drops them. We will follow the original flow.
-        
-        # Identify duplicates (for main df logic later if needed, but here we process unique KKS)
+        # Duplicated KKS + description rows are reported, then processed once
         duplicated_indices = df_kks_test[df_kks_test.duplicated()].index
         df_kks_test = df_kks_test.drop_duplicates()
         
-        # Logic for DESCRIPTION_new
-        index_more = (
-            df_kks_test["DESCRIPTION"]
-            .value_counts()[df_kks_test["DESCRIPTION"].value_counts() > 1]
-            .index
+        # DESCRIPTION_new: descriptions shared by several KKS get the KKS appended
+        description_counts = df_kks_test["DESCRIPTION"].map(df_kks_test["DESCRIPTION"].value_counts())
+        df_kks_test["DESCRIPTION_new"] = (
+            (df_kks_test["DESCRIPTION"] + "_" + df_kks_test["LOCATION_x"]).where(description_counts > 1, "")
         )
-        df_kks_test["DESCRIPTION_new"] = ""
-        for des in index_more:
-            df_sub = df_kks_test[df_kks_test["DESCRIPTION"] == des].copy()
-            df_sub["DESCRIPTION_new"] = df_sub["DESCRIPTION"] + "_" + df_sub["LOCATION_x"]
-            df_kks_test.loc[df_sub.index, "DESCRIPTION_new"] = df_sub["DESCRIPTION_new"]
             
         return df_kks_test, duplicated_indices
 
     @staticmethod
     def validate_codes(df_main, df_kks_test, refs):
         """Validates System, EQ, and Component codes."""
+        import numpy as np
+        import pandas as pd
+
         # Map KKS data back to main df
         df_main["SYSTEM"] = df_kks_test["SYSTEM"]
         df_main["EQ"] = df_kks_test["EQ"]
         df_main["COMPONENT"] = df_kks_test["COMPONENT"]
         
-        def check_code(row, col, ref_df):
-            val = row.get(col)
-            if pd.isna(val) or val == "":
-                return ""
-            return "มี" if val in ref_df["code"].values else "ไม่มี"
-
-        df_main["SYSTEM_STATUS"] = df_kks_test.apply(lambda r: check_code(r, "SYSTEM", refs['sys']), axis=1)
-        df_main["EQ_STATUS"] = df_kks_test.apply(lambda r: check_code(r, "EQ", refs['eq']), axis=1)
-        df_main["COMPONENT_STATUS"] = df_kks_test.apply(lambda r: check_code(r, "COMPONENT", refs['com']), axis=1)
+        def check_code(values, ref_df):
+            empty = values.isna() | (values == "")
+            status = np.where(values.isin(ref_df["code"]), "มี", "ไม่มี")
+            return pd.Series(np.where(empty, "", status), index=values.index, dtype=object)
+
+        df_main["SYSTEM_STATUS"] = check_code(df_kks_test["SYSTEM"], refs['sys'])
+        df_main["EQ_STATUS"] = check_code(df_kks_test["EQ"], refs['eq'])
+        df_main["COMPONENT_STATUS"] = check_code(df_kks_test["COMPONENT"], refs['com'])
         return df_main
 
     @staticmethod
     def validate_cost_center(df_original, df_cost_ref):
         """Validates cost center logic."""
+        import pandas as pd
+
         # Prepare working dataframe
         df1 = df_original.dropna(axis="index", how="all")
         df_cost = df1[["LOCATION", "EGCOSTCENTER", "EGBA", "LOCHIERARCHY.PARENT"]].copy()
@@ -207,126 +337,119 @@ class Validator:
         df_cost.loc[df_cost["LOCATION"].isna(), "COST_STATUS"] = 'ไม่มี LOCATION'
         
         # Preprocess ref
-        def preprocess_plant_names(df_make_cost):
-            df_make_cost["Plant Name Split"] = df_make_cost["Plant Name"].apply(lambda x: [name.strip() for name in x.split(',')] if ',' in x else [x.strip()])
-            df_make_cost["Plant Name1 Split"] = df_make_cost["Plant Name1"].apply(lambda x: [name.strip() for name in x.split(',')] if ',' in x else [x.strip()])
-            return df_make_cost
-
-        df_cost_ref["Plant Name"] = df_cost_ref["Plant Name"].astype(str)
-        df_cost_ref["Plant Name1"] = df_cost_ref["Plant Name1"].astype(str)
-        df_cost_ref = preprocess_plant_names(df_cost_ref)
+        df_cost_ref = DataLoader.prepare_cost_reference(df_cost_ref)
         
         df_cost["NUM_PLANT1"] = df_cost["NUM_PLANT"]
-        
+
+        if not df_cost.empty and plant_unit not in [2, 3, 4]:
+            raise ValueError("Invalid value for plant_unit. Only 2, 3 or 4 are allowed.")
+
+        # The reference lookups only depend on the plant prefix of LOCATION (and the
+        # plant unit), so they are done once per distinct prefix instead of per row
+        def split_units(values):
+            return {unit.strip() for value in values.dropna().astype(str) for unit in value.split(',')}
+
+        plants = {}
+
+        def plant_match(prefix):
+            if prefix not in plants:
+                name_hit = df_cost_ref["Plant Name Split"].apply(lambda x: prefix in x)
+                name1_hit = df_cost_ref["Plant Name1 Split"].apply(lambda x: prefix in x)
+                rows = df_cost_ref[name_hit | name1_hit]
+                plants[prefix] = {
+                    "rows": rows,
+                    "name": name_hit.any(),
+                    "name1": name1_hit.any(),
+                    "units": split_units(rows['Plant Unit']),
+                    "units1": split_units(rows['Plant Unit1']),
+                    "matched": {},
+                }
+            return plants[prefix]
+
+        def matched_cost_center(plant, num_plant):
+            # First reference row whose (unstripped) unit list holds num_plant, as (Cost Center, Business Area)
+            if num_plant not in plant["matched"]:
+                if plant["name"] and num_plant in plant["units"]:
+                    column = 'Plant Unit'
+                elif plant["name1"] and num_plant in plant["units1"]:
+                    column = 'Plant Unit1'
+                else:
+                    column = None
+                match = None
+                if column:
+                    rows = plant["rows"]
+                    hits = [num_plant in str(unit).split(',') for unit in rows[column]]
+                    if any(hits):
+                        first = rows[hits].iloc[0]
+                        match = (first['Cost Center'], first['Business Area'])
+                plant["matched"][num_plant] = match
+            return plant["matched"][num_plant]
+
+        prefixes = [loc[:plant_unit] if isinstance(loc, str) else "" for loc in df_cost["LOCATION"]]
+
         # Update extracted numbers logic
-        def update_extracted_numbers(row, df_make_cost, plant_unit):
-            if plant_unit not in [2, 3, 4]:
-                raise ValueError("Invalid value for plant_unit. Only 2, 3 or 4 are allowed.")
-            
-            prefix_length = plant_unit
-            total_plant_prefix = row["LOCATION"][:prefix_length] if isinstance(row["LOCATION"], str) else ""
-            
-            cost_center_row = df_make_cost[
-                df_make_cost["Plant Name Split"].apply(lambda x: total_plant_prefix in x) |
-                df_make_cost["Plant Name1 Split"].apply(lambda x: total_plant_prefix in x)
-            ]
-            if not cost_center_row.empty:  
-                plant_unit_values = cost_center_row['Plant Unit'].dropna().astype(str).str.split(',').explode().str.strip()
-                plant_unit_values1 = cost_center_row['Plant Unit1'].dropna().astype(str).str.split(',').explode().str.strip()
-                
-                if cost_center_row["Plant Name Split"].apply(lambda x: total_plant_prefix in x).any():
-                    if row["NUM_PLANT1"] not in plant_unit_values.values:
-                        row["NUM_PLANT1"] = 'ไม่พบ Plant Unit'
-                elif cost_center_row["Plant Name1 Split"].apply(lambda x: total_plant_prefix in x).any():
-                    if row["NUM_PLANT1"] not in plant_unit_values1.values:
-                        row["NUM_PLANT1"] = 'ไม่พบ Plant Unit'
-            elif row["NUM_PLANT1"] == 'ไม่มี LOCATION':
-                return row
-            else:
-                row["NUM_PLANT1"] = 'ไม่พบ Plant Name'
-            return row
+        num_plants = []
+        for prefix, num_plant in zip(prefixes, df_cost["NUM_PLANT1"]):
+            plant = plant_match(prefix)
+            if not plant["rows"].empty:
+                if plant["name"]:
+                    if num_plant not in plant["units"]:
+                        num_plant = 'ไม่พบ Plant Unit'
+                elif plant["name1"]:
+                    if num_plant not in plant["units1"]:
+                        num_plant = 'ไม่พบ Plant Unit'
+            elif num_plant != 'ไม่มี LOCATION':
+                num_plant = 'ไม่พบ Plant Name'
+            num_plants.append(num_plant)
+        df_cost["NUM_PLANT1"] = num_plants
 
-        df_cost = df_cost.apply(lambda row: update_extracted_numbers(row, df_cost_ref, plant_unit), axis=1)
-        
-        if 'COST_SHOULD_BE' not in df_cost.columns:
-            df_cost['COST_SHOULD_BE'] = ''
-
-        def cost_center_check(row, df_make_cost, plant_unit):
-            if plant_unit not in [2, 3, 4]:
-                raise ValueError("Invalid value for plant_unit. Only 2, 3 or 4 are allowed.")
-            prefix_length = plant_unit
-            total_plant_prefix = row["LOCATION"][:prefix_length] if isinstance(row["LOCATION"], str) else ""
-            if pd.isna(row["LOCATION"]):
-                return 'ไม่มี LOCATION'
-            
-            matching_row = df_make_cost[
-                df_make_cost["Plant Name Split"].apply(lambda x: total_plant_prefix in x) |
-                df_make_cost["Plant Name1 Split"].apply(lambda x: total_plant_prefix in x)
-            ]
+        def cost_center_check(prefix, location, num_plant, cost_center_value, business_area_value):
+            """Returns (COST_STATUS, COST_SHOULD_BE) for one row."""
+            if pd.isna(location):
+                return 'ไม่มี LOCATION', ''
             
-            if matching_row.empty and not pd.isna(row["LOCATION"]):
-                df_cost.at[row.name, 'COST_SHOULD_BE'] = 're_check'
-                return row["NUM_PLANT1"]
+            plant = plant_match(prefix)
+            if plant["rows"].empty:
+                return num_plant, 're_check'
             
-            plant_unit_values = matching_row['Plant Unit'].dropna().astype(str).str.split(',').explode().str.strip()
-            plant_unit_values1 = matching_row['Plant Unit1'].dropna().astype(str).str.split(',').explode().str.strip()
-            
-            if (total_plant_prefix in matching_row["Plant Name Split"].explode().values and
-                row['NUM_PLANT1'] in plant_unit_values.values):
-                matched_row = matching_row[matching_row.apply(lambda x: row['NUM_PLANT1'] in str(x['Plant Unit']).split(','), axis=1)]
-            elif (total_plant_prefix in matching_row["Plant Name1 Split"].explode().values and
-                row['NUM_PLANT1'] in plant_unit_values1.values):
-                matched_row = matching_row[matching_row.apply(lambda x: row['NUM_PLANT1'] in str(x['Plant Unit1']).split(','), axis=1)]
-            else:
-                matched_row = pd.DataFrame()
+            match = matched_cost_center(plant, num_plant)
+            if match is None:
+                return 'ไม่พบ Plant Unit', 're_check'
+            cost_center, business_area = match
             
-            if matched_row.empty and not pd.isna(row["LOCATION"]):
-                df_cost.at[row.name, 'COST_SHOULD_BE'] = 're_check'
-                return 'ไม่พบ Plant Unit'
-            elif matched_row.empty:
-                return 'ข้อผิดพลาดใหม่'
-            
-            cost_center_match = row['EGCOSTCENTER'] == matched_row.iloc[0]['Cost Center']
-            business_area_match = row['EGBA'] == matched_row.iloc[0]['Business Area']
+            cost_center_match = cost_center_value == cost_center
+            business_area_match = business_area_value == business_area
             
             if not cost_center_match and not business_area_match:
-                if pd.isna(row['EGCOSTCENTER']) and pd.isna(row['EGBA']):
-                    df_cost.at[row.name, 'COST_SHOULD_BE'] = f"{matched_row.iloc[0]['Cost Center']},{matched_row.iloc[0]['Business Area']}"
-                    return 'ไม่มี EGCOSTCENTER เเละ EGBA'
-                df_cost.at[row.name, 'COST_SHOULD_BE'] = f"{matched_row.iloc[0]['Cost Center']},{matched_row.iloc[0]['Business Area']}"
-                return 'EGCOSTCENTER เเละ EGBA ไม่สอดคล้องกัน'
+                if pd.isna(cost_center_value) and pd.isna(business_area_value):
+                    return 'ไม่มี EGCOSTCENTER เเละ EGBA', f"{cost_center},{business_area}"
+                return 'EGCOSTCENTER เเละ EGBA ไม่สอดคล้องกัน', f"{cost_center},{business_area}"
             elif not cost_center_match:
-                if pd.isna(row['EGCOSTCENTER']):
-                    df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Cost Center']
-                    return 'ไม่มี EGCOSTCENTER'
+                if pd.isna(cost_center_value):
+                    return 'ไม่มี EGCOSTCENTER', cost_center
                 
-                if  ('Common' in plant_unit_values.values or 
-                    'Common' in plant_unit_values1.values):
-                    cost_center = matched_row.iloc[0]['Cost Center']
+                if 'Common' in plant["units"] or 'Common' in plant["units1"]:
                     modified_cost_center = (cost_center + '00' if len(cost_center) == 7 
                                             else cost_center[:-2] if len(cost_center) == 9 and cost_center.endswith('00')
                                             else cost_center)
                     
-                    if row['EGCOSTCENTER'] == modified_cost_center:
-                        df_cost.at[row.name, 'COST_SHOULD_BE'] = 'do_nothing'
-                        return 'OK'
-                    else:
-                        df_cost.at[row.name, 'COST_SHOULD_BE'] = modified_cost_center
-                        return 'EGCOSTCENTER ไม่สอดคล้องกัน'
-                else:
-                    df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Cost Center']
-                    return 'EGCOSTCENTER ไม่สอดคล้องกัน'
+                    if cost_center_value == modified_cost_center:
+                        return 'OK', 'do_nothing'
+                    return 'EGCOSTCENTER ไม่สอดคล้องกัน', modified_cost_center
+                return 'EGCOSTCENTER ไม่สอดคล้องกัน', cost_center
             elif not business_area_match:
-                if pd.isna(row['EGBA']):
-                    df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Business Area']
-                    return 'ไม่มี EGBA'
-                df_cost.at[row.name, 'COST_SHOULD_BE'] = matched_row.iloc[0]['Business Area']
-                return 'EGBA ไม่สอดคล้องกัน'
+                if pd.isna(business_area_value):
+                    return 'ไม่มี EGBA', business_area
+                return 'EGBA ไม่สอดคล้องกัน', business_area
             
-            df_cost.at[row.name, 'COST_SHOULD_BE'] = 'do_nothing'
-            return 'OK'
+            return 'OK', 'do_nothing'
 
-        df_cost['COST_STATUS'] = df_cost.apply(lambda row: cost_center_check(row, df_cost_ref, plant_unit), axis=1)
+        results = [
+            cost_center_check(*values)
+            for values in zip(prefixes, df_cost["LOCATION"], df_cost["NUM_PLANT1"], df_cost["EGCOSTCENTER"], df_cost["EGBA"])
+        ]
+        df_cost['COST_SHOULD_BE'] = [should_be for _, should_be in results]
+        df_cost['COST_STATUS'] = [status for status, _ in results]
         return df_cost
 
     @staticmethod
@@ -336,41 +459,313 @@ class Validator:
         df_parent["PARENT_STATUS"] = ''
         
         non_na_condition = df_parent["LOCATION"].notna() & df_parent["LOCHIERARCHY.PARENT"].notna()
+        locations = set(df_parent.loc[df_parent["LOCATION"].notna(), "LOCATION"])
 
-        df_parent.loc[non_na_condition, "PARENT_STATUS"] = df_parent.loc[non_na_condition].apply(
-            lambda row: ('OK' if df_parent["LOCATION"].eq(row["LOCHIERARCHY.PARENT"]).any() else 'ไม่พบ PARENT') 
-            if pd.notna(row["LOCATION"]) and pd.notna(row["LOCHIERARCHY.PARENT"]) and row["LOCHIERARCHY.PARENT"] in row["LOCATION"] 
-            else 'PARENT ไม่สอดคล้อง', axis=1
-        )
+        df_parent.loc[non_na_condition, "PARENT_STATUS"] = [
+            ('OK' if parent in locations else 'ไม่พบ PARENT') if parent in location else 'PARENT ไม่สอดคล้อง'
+            for location, parent in zip(df_parent.loc[non_na_condition, "LOCATION"],
+                                        df_parent.loc[non_na_condition, "LOCHIERARCHY.PARENT"])
+        ]
 
         df_parent.loc[df_parent["LOCATION"].isna(), "PARENT_STATUS"] = 'ไม่มี LOCATION'
         df_parent.loc[df_parent["LOCHIERARCHY.PARENT"].isna(), "PARENT_STATUS"] = 'ไม่มี PARENT'
         
         return df_parent["PARENT_STATUS"]
 
+class ResultWriter(abc.ABC):
+    """
+    Base class for result writers.
+
+    A writer outputs the given columns, by default the Config.OUTPUT_COLS
+    results table. Look writers up with for_format()/for_path(); add new
+    formats to RESULT_WRITERS.
+    """
+    EXTENSION = None
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else Config.OUTPUT_COLS
+
+    @abc.abstractmethod
+    def write(self, df, file_output):
+        """Writes the results table of df to file_output."""
+
+    @abc.abstractmethod
+    def read(self, file_input):
+        """Loads a results file written by this writer back into a DataFrame."""
+
+    def typed(self, df):
+        """Returns the output columns with explicit dtypes for columnar formats."""
+        df_out = df[self.columns].copy()
+        for col in df_out.columns:
+            if col == "LEVEL":
+                df_out[col] = df_out[col].astype("int64")
+            elif col.endswith("_STATUS"):
+                df_out[col] = df_out[col].astype("string").astype("category")
+            else:
+                df_out[col] = df_out[col].astype("string")
+        return df_out
+
+    @staticmethod
+    def level_as_int(df):
+        """
+        Restores the int LEVEL column of a table read back as text.
+
+        Text formats are read with every cell as str, so "TRUE", "NA" or leading
+        zeros are not re-guessed into bools, NaN or numbers.
+        """
+        if "LEVEL" in df.columns:
+            df["LEVEL"] = df["LEVEL"].astype("int64")
+        return df
+
+    @staticmethod
+    def for_format(output_format, columns=None):
+        """Returns a writer instance for a format name such as 'xlsx' or 'parquet'."""
+        key = output_format.lower().lstrip(".")
+        if key not in RESULT_WRITERS:
+            raise ValueError(f"Unsupported output format '{output_format}'. Choose from: {', '.join(RESULT_WRITERS)}")
+        return RESULT_WRITERS[key](columns)
+
+    @staticmethod
+    def for_path(file_output, columns=None):
+        """Returns a writer instance chosen by the file extension of file_output."""
+        return ResultWriter.for_format(os.path.splitext(file_output)[1] or "?", columns)
+
+class ExcelResultWriter(ResultWriter):
+    """Location_review_*.xlsx. Kept untyped; the results table keeps its index column."""
+    EXTENSION = "xlsx"
+
+    def __init__(self, columns=None):
+        super().__init__(columns)
+        # The results table has always carried the DataFrame index in column A
+        self.index = columns is None
+
+    def write(self, df, file_output):
+        df[self.columns].to_excel(file_output, index=self.index)
+
+    def read(self, file_input):
+        import pandas as pd
+
+        df = pd.read_excel(file_input, index_col=0 if self.index else None, dtype=str, keep_default_na=False)
+        return ResultWriter.level_as_int(df)
+
+class CsvResultWriter(ResultWriter):
+    EXTENSION = "csv"
+
+    def write(self, df, file_output):
+        # utf-8-sig so Excel opens the Thai status strings correctly
+        self.typed(df).to_csv(file_output, index=False, encoding="utf-8-sig")
+
+    def read(self, file_input):
+        import pandas as pd
+
+        df = pd.read_csv(file_input, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+        return ResultWriter.level_as_int(df)
+
+class JsonLinesResultWriter(ResultWriter):
+    EXTENSION = "jsonl"
+
+    def write(self, df, file_output):
+        self.typed(df).to_json(file_output, orient="records", lines=True, force_ascii=False)
+
+    def read(self, file_input):
+        import pandas as pd
+
+        return pd.read_json(file_input, orient="records", lines=True, dtype=False)
+
+class ParquetResultWriter(ResultWriter):
+    """Requires pyarrow (pip install pyarrow)."""
+    EXTENSION = "parquet"
+
+    def write(self, df, file_output):
+        self.typed(df).to_parquet(file_output, index=False)
+
+    def read(self, file_input):
+        import pandas as pd
+
+        return pd.read_parquet(file_input)
+
+RESULT_WRITERS = {
+    writer.EXTENSION: writer
+    for writer in (ExcelResultWriter, CsvResultWriter, JsonLinesResultWriter, ParquetResultWriter)
+}
+
+class ResultSummary:
+    """Summarizes validation results without building the Excel report."""
+
+    # Status columns reported by the dry run, in report order
+    STATUS_COLS = [
+        "LEVEL", "COST_STATUS", "PARENT_STATUS", "LOCATION_STATUS",
+        "SYSTEM_STATUS", "EQ_STATUS", "COMPONENT_STATUS"
+    ]
+
+    @staticmethod
+    def failures(df):
+        """Returns a boolean DataFrame: True where a row fails that status column."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "LEVEL": df["LEVEL"] != 0,
+            "COST_STATUS": df["COST_STATUS"] != "OK",
+            "PARENT_STATUS": df["PARENT_STATUS"] != "OK",
+            "LOCATION_STATUS": df["LOCATION_STATUS"] == "FALSE",
+            "SYSTEM_STATUS": df["SYSTEM_STATUS"] == "ไม่มี",
+            "EQ_STATUS": df["EQ_STATUS"] == "ไม่มี",
+            "COMPONENT_STATUS": df["COMPONENT_STATUS"] == "ไม่มี",
+        }, index=df.index)
+
+    @staticmethod
+    def status_counts(df):
+        """Returns {status column: {value: row count}} for the status columns."""
+        counts = {}
+        for col in ResultSummary.STATUS_COLS:
+            values = df[col].fillna("").value_counts()
+            counts[col] = {str(value): int(count) for value, count in values.items()}
+        return counts
+
+    @staticmethod
+    def log_summary(df):
+        """Logs per-status counts and the number of failing rows."""
+        logger.info(f"Summary: {len(df)} rows validated")
+        for col, values in ResultSummary.status_counts(df).items():
+            breakdown = ", ".join(f"{value or '(blank)'}={count}" for value, count in values.items())
+            logger.info(f"  {col}: {breakdown}")
+        failing = ResultSummary.failures(df)
+        logger.info(f"  Failing rows: {int(failing.any(axis=1).sum())} of {len(df)}")
+
+    @staticmethod
+    def write_failures(df, file_output):
+        """Writes only the failing rows of df; the format follows the file extension."""
+        df_fail = df[ResultSummary.failures(df).any(axis=1)]
+        ResultWriter.for_path(file_output).write(df_fail, file_output)
+        logger.info(f"Wrote {len(df_fail)} failing rows to {file_output}")
+
+class ResultDiff:
+    """Compares two validation result sets (Config.OUTPUT_COLS) row by row."""
+
+    NEWLY_BROKEN = "newly_broken"
+    FIXED = "fixed"
+    CHANGED = "changed"
+    ADDED = "added"
+    REMOVED = "removed"
+
+    DIFF_COLS = ["LOCATION", "STATUS_COLUMN", "CHANGE", "OLD", "NEW"]
+    # Columns of the result sets that take part in the comparison
+    KEY_COLS = ["LOCATION"] + ResultSummary.STATUS_COLS
+
+    @staticmethod
+    def normalize(df):
+        """Makes results read back from any format comparable (blanks as "", int LEVEL)."""
+        import pandas as pd
+
+        df_norm = df[ResultDiff.KEY_COLS].reset_index(drop=True).astype(object)
+        df_norm = df_norm.where(df_norm.notna(), "")
+        for col in ResultDiff.KEY_COLS:
+            if col == "LEVEL":
+                df_norm[col] = pd.to_numeric(df_norm[col].replace("", 0)).astype("int64")
+            else:
+                df_norm[col] = df_norm[col].astype(str)
+        return df_norm
+
+    @staticmethod
+    def keyed(df):
+        """Adds _KEY (64-bit hash of LOCATION) and _OCC (occurrence of that key) columns."""
+        import pandas as pd
+
+        df = df.copy()
+        df["_KEY"] = pd.util.hash_pandas_object(df["LOCATION"], index=False).to_numpy()
+        # Duplicate LOCATIONs are paired in order of appearance
+        df["_OCC"] = df.groupby("_KEY", sort=False).cumcount()
+        return df
+
+    @staticmethod
+    def diff(df_old, df_new):
+        """
+        Returns one row per (LOCATION, status column) that differs between the runs.
+
+        Rows are joined on a hash of LOCATION, so the cost is linear in the number
+        of rows. CHANGE is newly_broken, fixed or changed (a different value, both
+        failing or both passing); rows present in only one run are added/removed.
+        """
+        import pandas as pd
+
+        df_old = ResultDiff.keyed(ResultDiff.normalize(df_old))
+        df_new = ResultDiff.keyed(ResultDiff.normalize(df_new))
+        merged = df_old.merge(df_new, on=["_KEY", "_OCC"], how="outer", suffixes=("_old", "_new"), indicator=True)
+
+        both = merged[merged["_merge"] == "both"].reset_index(drop=True)
+        collisions = both["LOCATION_old"] != both["LOCATION_new"]
+        if collisions.any():
+            # Astronomically unlikely with 64-bit hashes, but never report a wrong pairing
+            logger.warning(f"Ignoring {int(collisions.sum())} rows with LOCATION hash collisions")
+            both = both[~collisions].reset_index(drop=True)
+
+        def side(frame, suffix):
+            return frame[[f"{col}_{suffix}" for col in ResultDiff.KEY_COLS]].set_axis(ResultDiff.KEY_COLS, axis=1)
+
+        old_side, new_side = side(both, "old"), side(both, "new")
+        old_fail, new_fail = ResultSummary.failures(old_side), ResultSummary.failures(new_side)
+
+        parts = []
+        for col in ResultSummary.STATUS_COLS:
+            differs = old_side[col] != new_side[col]
+            change = pd.Series(ResultDiff.CHANGED, index=both.index)
+            change[~old_fail[col] & new_fail[col]] = ResultDiff.NEWLY_BROKEN
+            change[old_fail[col] & ~new_fail[col]] = ResultDiff.FIXED
+            parts.append(pd.DataFrame({
+                "LOCATION": old_side.loc[differs, "LOCATION"],
+                "STATUS_COLUMN": col,
+                "CHANGE": change[differs],
+                "OLD": old_side.loc[differs, col].astype(str),
+                "NEW": new_side.loc[differs, col].astype(str),
+            }))
+
+        for indicator, change, suffix in [("right_only", ResultDiff.ADDED, "new"), ("left_only", ResultDiff.REMOVED, "old")]:
+            rows = merged[merged["_merge"] == indicator]
+            parts.append(pd.DataFrame({
+                "LOCATION": rows[f"LOCATION_{suffix}"],
+                "STATUS_COLUMN": "",
+                "CHANGE": change,
+                "OLD": "",
+                "NEW": "",
+            }))
+
+        return pd.concat(parts, ignore_index=True)[ResultDiff.DIFF_COLS]
+
+    @staticmethod
+    def log_summary(df_diff):
+        """Logs the number of changes per status column and change type."""
+        if df_diff.empty:
+            logger.info("Diff: no differences between the two runs")
+            return
+        counts = df_diff.groupby(["STATUS_COLUMN", "CHANGE"], sort=False).size()
+        logger.info(f"Diff: {len(df_diff)} differences")
+        for (col, change), count in counts.items():
+            logger.info(f"  {col or 'ROW'}: {change}={count}")
+
+    @staticmethod
+    def write(df_diff, file_output):
+        """Writes the diff table; the format follows the file extension (see RESULT_WRITERS)."""
+        ResultWriter.for_path(file_output, columns=ResultDiff.DIFF_COLS).write(df_diff, file_output)
+        logger.info(f"Wrote {len(df_diff)} differences to {file_output}")
+
 class ExcelReporter:
     """Handles formatting and saving the output Excel."""
+
+    # Result columns copied in front of the template columns (A:H)
+    REPORT_COLS = Config.OUTPUT_COLS[:8]
     
     @staticmethod
-    def generate_excel_report(file_input, sheet_name, file_output, ws1_data_source_file):
+    def prepare_template(file_input, sheet_name):
         """
-        Applies the exact formatting logic from the original script.
+        Loads the input template as the report workbook: keeps only sheet_name
+        and inserts the 8 result columns in front of it.
+
+        Independent of the validation results, so it can run concurrently with them.
         """
-        logger.info(f"Step 7/7: Generating Excel report: {file_output}")
-        
-        try:
-            wb1 = openpyxl.load_workbook(file_input, keep_vba=False, data_only=False)
-            ws1 = wb1[sheet_name]
-        except Exception as e:
-            logger.error(f"Error loading workbook 1: {e}")
-            exit(1)
+        import openpyxl
 
-        try:
-            wb2 = load_workbook(ws1_data_source_file)
-            ws2 = wb2.active
-        except Exception as e:
-            logger.error(f"Error loading workbook 2: {e}")
-            exit(1)
+        wb1 = openpyxl.load_workbook(file_input, keep_vba=False, data_only=False)
+        ws1 = wb1[sheet_name]
 
         # Delete all sheets except the one specified
         all_sheets = wb1.sheetnames
@@ -378,20 +773,50 @@ class ExcelReporter:
             if sheet != sheet_name:
                 del wb1[sheet]
 
+        ws1.insert_cols(1,8)    # insert_cols 8 columns
+        return wb1
+
+    @staticmethod
+    def generate_excel_report(file_input, sheet_name, file_output, df_results, template=None):
+        """
+        Applies the exact formatting logic from the original script.
+
+        df_results is the validated DataFrame; its first REPORT_COLS go in front of
+        the template columns. template is a workbook from prepare_template(); it is
+        loaded here if not given.
+        """
+        import pandas as pd
+        from openpyxl.styles import Border, Side, PatternFill
+
+        def cell_value(value):
+            # Blanks are written as empty cells, as the xlsx results file stores them
+            return None if (isinstance(value, str) and value == "") or pd.isna(value) else value
+
+        logger.info(f"Step 7/7: Generating Excel report: {file_output}")
+        
+        if template is None:
+            try:
+                template = ExcelReporter.prepare_template(file_input, sheet_name)
+            except Exception as e:
+                logger.error(f"Error loading workbook 1: {e}")
+                exit(1)
+        wb1 = template
+        ws1 = wb1[sheet_name]
+        df_report = df_results[ExcelReporter.REPORT_COLS]
+
         blue_fill = PatternFill(start_color='C5D9F1', end_color='C5D9F1', fill_type='solid')
         yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
         red_fill = PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid')
 
-        ws1.insert_cols(1,8)    # insert_cols 8 columns
-
         row_offset = 6  # Start writing at row 7 in ws1
         col_offset = 1  # Start writing at column A in ws1
 
-        for i, row in enumerate(ws2.iter_rows(min_row=1, max_row=ws2.max_row, min_col=2, max_col=9)):   # B1 : I1
-            for j, cell in enumerate(row):
+        rows = [ExcelReporter.REPORT_COLS] + list(df_report.itertuples(index=False, name=None))   # header, then data
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
                 target_row = i + row_offset
                 target_col = j + col_offset
-                ws1.cell(row=target_row, column=target_col, value=cell.value)
+                ws1.cell(row=target_row, column=target_col, value=cell_value(value))
 
         # Check Location and Description
         for row in range(7, ws1.max_row + 1):   # Start from row 7
@@ -441,12 +866,11 @@ class ExcelReporter:
                 cell.fill = fill
 
         # Check the accuracy of the LOCATION
-        for row in range(2, ws2.max_row + 1):
-            value_in_I = ws2.cell(row=row, column=10).value  # Column J is the 9th column
-            value_in_B = ws2.cell(row=row, column=2).value  # Column B is the 2nd column
+        for location, location_status in zip(df_results["LOCATION"], df_results["LOCATION_STATUS"]):
+            value_in_B = cell_value(location)
 
-            if value_in_I == 'FALSE':
-                # Check if value in ws2 column B row matches any value in ws1 column H starting from row 7
+            if location_status == 'FALSE':
+                # Check if LOCATION matches any value in ws1 column H starting from row 7
                 for row_ws1 in range(7, ws1.max_row + 1):
                     if ws1.cell(row=row_ws1, column=8).value == value_in_B:  # Column H is the 8th column
                         ws1.cell(row=row_ws1, column=8).fill = yellow_fill
@@ -484,9 +908,183 @@ class ExcelReporter:
             logger.error(f"Error saving file: {e}")
         finally:
             wb1.close()
-            wb2.close()
 
-def main(sheet_name=None, file_input=None, database_code=None):
+def warm_up():
+    """Imports the heavy dependencies ahead of time.
+
+    Safe to call from a background thread; the first validation then finds
+    pandas, numpy and openpyxl already in sys.modules.
+    """
+    import pandas  # noqa: F401
+    import numpy  # noqa: F401
+    import openpyxl  # noqa: F401
+    import openpyxl.styles  # noqa: F401
+
+PIPELINES = (None, "thread", "process")
+
+class PipelineTimer:
+    """
+    Records when each stage of a run starts and finishes.
+
+    Stages declare the stages they depend on; log_report() prints the timeline
+    and the critical path, i.e. the chain of dependencies that finished last
+    and therefore set the total run time.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.stages = {}  # name -> [start, end, dependencies], seconds since origin
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def start(self, name, depends_on=()):
+        self.stages[name] = [self.now(), None, tuple(depends_on)]
+
+    def finish(self, name):
+        self.stages[name][1] = self.now()
+
+    def submit(self, executor, name, func, *args, depends_on=()):
+        """Submits func(*args) to executor as a timed stage; returns the Future."""
+        self.start(name, depends_on)
+        future = executor.submit(func, *args)
+        future.add_done_callback(lambda _: self.finish(name))
+        return future
+
+    @contextlib.contextmanager
+    def stage(self, name, depends_on=()):
+        """Times the enclosed block as a stage."""
+        self.start(name, depends_on)
+        try:
+            yield
+        finally:
+            self.finish(name)
+
+    def critical_path(self):
+        finished = {name: stage for name, stage in self.stages.items() if stage[1] is not None}
+        if not finished:
+            return []
+        name = max(finished, key=lambda n: finished[n][1])
+        path = [name]
+        while True:
+            depends_on = [n for n in finished[name][2] if n in finished]
+            if not depends_on:
+                break
+            name = max(depends_on, key=lambda n: finished[n][1])
+            path.append(name)
+        return path[::-1]
+
+    def log_report(self):
+        stages = sorted(((s[0], s[1], name) for name, s in self.stages.items() if s[1] is not None))
+        if not stages:
+            return
+        logger.info("Stage timings (ms from start):")
+        for start, end, name in stages:
+            logger.info(f"  {name:<16} {start * 1000:8.0f} -> {end * 1000:8.0f}  ({(end - start) * 1000:.0f} ms)")
+        path = self.critical_path()
+        total = max(end for _, end, _ in stages)
+        busy = sum(end - start for start, end, _ in stages)
+        logger.info(f"Critical path: {' -> '.join(path)} = {total * 1000:.0f} ms "
+                    f"(stages add up to {busy * 1000:.0f} ms)")
+
+def run_validation(df_main, refs, validator=Validator):
+    """
+    Runs validation steps 3-6 on a loaded input DataFrame.
+
+    Returns df_main with every column of Config.OUTPUT_COLS filled in.
+    validator is the class providing the stage implementations (the
+    equivalence benchmark passes the row-wise reference implementation).
+    """
+    # 2. Validate Location Format
+    logger.info("Step 3/7: Validating Location Format...")
+    df_main["LOCATION_STATUS"] = validator.validate_location_format(df_main)
+    
+    # 3. Process KKS for Codes
+    logger.info("Step 4/7: Processing KKS Codes...")
+    df_kks_test, duplicated_indices = validator.process_kks(df_main)
+    
+    # 4. Validate Codes (System, EQ, Component)
+    # Map DESCRIPTION_new back to df_main
+    df_main["DESCRIPTION_new"] = ""
+    df_main.loc[df_kks_test.index, "DESCRIPTION_new"] = df_kks_test["DESCRIPTION_new"]
+    
+    # Apply logic for COMMENT, SHOULD_BE, LEVEL
+    all_na_rows = df_main.isna().all(axis=1)
+    df_main.loc[all_na_rows] = df_main.loc[all_na_rows].astype(object)
+    df_main.loc[all_na_rows] = df_main.loc[all_na_rows].fillna("xx")
+    df_main["COMMENT"] = ""
+    df_main["SHOULD_BE"] = ""
+    df_main["LEVEL"] = 0
+    
+    # Handle duplicates logic
+    if not duplicated_indices.empty:
+        df_main.loc[duplicated_indices, "COMMENT"] = "kks และ description ซ้ำกับแถวอื่นๆ"
+        df_main.loc[duplicated_indices, "SHOULD_BE"] = "ลบทิ้ง"
+        df_main.loc[duplicated_indices, "LEVEL"] = 2
+    
+    index_location = df_main[df_main["LOCATION"].isna()].index
+    df_main.loc[index_location, "COMMENT"] = "ไม่พบ kks location"
+    df_main.loc[index_location, "SHOULD_BE"] = "re_check"
+    df_main.loc[index_location, "LEVEL"] = 2
+    
+    index_desc = df_main[df_main["DESCRIPTION"].isna()].index
+    df_main.loc[index_desc, "COMMENT"] = "ไม่พบ description"
+    df_main.loc[index_desc, "SHOULD_BE"] = "re_check"
+    df_main.loc[index_desc, "LEVEL"] = 2
+    
+    cond1 = (df_main["DESCRIPTION_new"] == "")
+    cond2 = df_main["LOCATION"].notna()
+    cond3 = df_main["DESCRIPTION"].notna()
+    index_null_desc = df_main[cond1 & cond2 & cond3].index
+    df_main.loc[index_null_desc, "COMMENT"] = "Ok"
+    df_main.loc[index_null_desc, "SHOULD_BE"] = "do_nothing"
+    df_main.loc[index_null_desc, "LEVEL"] = 0
+    
+    cond1 = ((df_main["DESCRIPTION_new"] != "") & (df_main["DESCRIPTION_new"] != "xx") & (df_main["DESCRIPTION_new"].notna()))
+    index_not_null_desc = df_main[cond1 & cond2 & cond3].index
+    
+    df_main.loc[index_not_null_desc, "COMMENT"] = "description ซ้ำกันแต่ kks ไม่ซ้ำ"
+    df_main.loc[index_not_null_desc, "SHOULD_BE"] = df_main.loc[index_not_null_desc, "DESCRIPTION_new"]
+    df_main.loc[index_not_null_desc, "LEVEL"] = 1
+
+    # Validate Codes
+    logger.info("Step 5/7: Validating System, EQ, and Component Codes...")
+    df_main = validator.validate_codes(df_main, df_kks_test, refs)
+
+    # 5. Validate Cost Center
+    logger.info("Step 6/7: Validating Cost Centers and Hierarchy...")
+    df_cost = validator.validate_cost_center(df_main, refs['cost'])
+    df_main["COST_STATUS"] = df_cost["COST_STATUS"]
+    df_main["COST_SHOULD_BE"] = df_cost["COST_SHOULD_BE"]
+
+    # 6. Validate Parent
+    df_main["PARENT_STATUS"] = validator.validate_parent(df_main)
+
+    for col in Config.OUTPUT_COLS:
+        if col not in df_main.columns:
+            df_main[col] = ""
+
+    return df_main
+
+def main(sheet_name=None, file_input=None, database_code=None, dry_run=False, failures_output=None,
+         output_format="xlsx", pipeline=None):
+    """
+    Runs the full validation.
+
+    With dry_run=True, stops after Step 6: logs per-status counts and skips both
+    the results file and the formatted report. failures_output, if given,
+    receives the failing rows only (format chosen by extension).
+    output_format selects the writer for Location_review_<sheet>.<ext>
+    (see RESULT_WRITERS).
+
+    pipeline loads the reference data and the input concurrently instead of
+    one after another: "thread" uses a thread pool, "process" worker processes.
+    The report template is loaded in a thread once the input is in, so it
+    overlaps validation and writing the results. Either way the stage timings
+    and critical path are logged.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
     logger.info("=== Starting Location Validator v1.0.0 ===")
     
     # Update Config if arguments are provided
@@ -499,109 +1097,130 @@ def main(sheet_name=None, file_input=None, database_code=None):
 
     logger.info(f"Configuration: Sheet={Config.SHEET_NAME}, Input={Config.FILE_INPUT}, DB={Config.DATABASE_CODE}")
 
-    # 1. Load Data
-    try:
-        refs = DataLoader.load_reference_data(Config.DATABASE_CODE)
-        df_main = DataLoader.load_input_data(Config.FILE_INPUT, Config.SHEET_NAME)
-    except Exception as e:
-        logger.critical(f"Initialization failed: {e}")
-        return False # Return failure
+    if pipeline not in PIPELINES:
+        logger.critical(f"Unknown pipeline '{pipeline}'. Available: {', '.join(p for p in PIPELINES if p)}")
+        return False
 
-    # 2. Validate Location Format
-    logger.info("Step 3/7: Validating Location Format...")
-    try:
-        df_main["LOCATION_STATUS"] = Validator.validate_location_format(df_main)
-        
-        # 3. Process KKS for Codes
-        logger.info("Step 4/7: Processing KKS Codes...")
-        df_kks_test, duplicated_indices = Validator.process_kks(df_main)
-        
-        # 4. Validate Codes (System, EQ, Component)
-        # Map DESCRIPTION_new back to df_main
-        df_main["DESCRIPTION_new"] = ""
-        df_main.loc[df_kks_test.index, "DESCRIPTION_new"] = df_kks_test["DESCRIPTION_new"]
-        
-        # Apply logic for COMMENT, SHOULD_BE, LEVEL
-        all_na_rows = df_main.isna().all(axis=1)
-        df_main.loc[all_na_rows] = df_main.loc[all_na_rows].astype(object)
-        df_main.loc[all_na_rows] = df_main.loc[all_na_rows].fillna("xx")
-        df_main["COMMENT"] = ""
-        df_main["SHOULD_BE"] = ""
-        df_main["LEVEL"] = 0
-        
-        # Handle duplicates logic
-        if not duplicated_indices.empty:
-            df_main.loc[duplicated_indices, "COMMENT"] = "kks และ description ซ้ำกับแถวอื่นๆ"
-            df_main.loc[duplicated_indices, "SHOULD_BE"] = "ลบทิ้ง"
-            df_main.loc[duplicated_indices, "LEVEL"] = 2
-        
-        index_location = df_main[df_main["LOCATION"].isna()].index
-        df_main.loc[index_location, "COMMENT"] = "ไม่พบ kks location"
-        df_main.loc[index_location, "SHOULD_BE"] = "re_check"
-        df_main.loc[index_location, "LEVEL"] = 2
-        
-        index_desc = df_main[df_main["DESCRIPTION"].isna()].index
-        df_main.loc[index_desc, "COMMENT"] = "ไม่พบ description"
-        df_main.loc[index_desc, "SHOULD_BE"] = "re_check"
-        df_main.loc[index_desc, "LEVEL"] = 2
-        
-        cond1 = (df_main["DESCRIPTION_new"] == "")
-        cond2 = df_main["LOCATION"].notna()
-        cond3 = df_main["DESCRIPTION"].notna()
-        index_null_desc = df_main[cond1 & cond2 & cond3].index
-        df_main.loc[index_null_desc, "COMMENT"] = "Ok"
-        df_main.loc[index_null_desc, "SHOULD_BE"] = "do_nothing"
-        df_main.loc[index_null_desc, "LEVEL"] = 0
-        
-        cond1 = ((df_main["DESCRIPTION_new"] != "") & (df_main["DESCRIPTION_new"] != "xx") & (df_main["DESCRIPTION_new"].notna()))
-        index_not_null_desc = df_main[cond1 & cond2 & cond3].index
-        
-        df_main.loc[index_not_null_desc, "COMMENT"] = "description ซ้ำกันแต่ kks ไม่ซ้ำ"
-        df_main.loc[index_not_null_desc, "SHOULD_BE"] = df_main.loc[index_not_null_desc, "DESCRIPTION_new"]
-        df_main.loc[index_not_null_desc, "LEVEL"] = 1
-
-        # Validate Codes
-        logger.info("Step 5/7: Validating System, EQ, and Component Codes...")
-        df_main = Validator.validate_codes(df_main, df_kks_test, refs)
-
-        # 5. Validate Cost Center
-        logger.info("Step 6/7: Validating Cost Centers and Hierarchy...")
-        df_cost = Validator.validate_cost_center(df_main, refs['cost'])
-        df_main["COST_STATUS"] = df_cost["COST_STATUS"]
-        df_main["COST_SHOULD_BE"] = df_cost["COST_SHOULD_BE"]
-
-        # 6. Validate Parent
-        df_main["PARENT_STATUS"] = Validator.validate_parent(df_main)
-
-        # 7. Generate Output
-        output_cols = [
-            "LOCATION", "DESCRIPTION", "COMMENT", "SHOULD_BE", "LEVEL",
-            "COST_STATUS", "COST_SHOULD_BE", "PARENT_STATUS", "LOCATION_STATUS",
-            "SYSTEM", "SYSTEM_STATUS", "EQ", "EQ_STATUS", "COMPONENT", "COMPONENT_STATUS"
-        ]
-        
-        for col in output_cols:
-            if col not in df_main.columns:
-                df_main[col] = ""
-                
-        # Save intermediate file
-        file_dir = os.path.dirname(Config.FILE_INPUT)
-        file_output_name = f"Location_review_{Config.SHEET_NAME}.xlsx"
-        file_intermediate = os.path.join(file_dir, file_output_name)
-        
-        df_main[output_cols].to_excel(file_intermediate)
-        
-        # Generate Final Report
-        file_base = os.path.splitext(os.path.basename(Config.FILE_INPUT))[0]
-        file_final = os.path.join(file_dir, f"{file_base}(REVIEW).xlsx")
-        
-        ExcelReporter.generate_excel_report(Config.FILE_INPUT, Config.SHEET_NAME, file_final, file_intermediate)
-        logger.info("=== Processing Complete Successfully ===")
-        return True # Return success
+    timer = PipelineTimer()
+    with contextlib.ExitStack() as executors:
+        # 1. Load Data
+        future_template = None
+        try:
+            if pipeline:
+                logger.info(f"Loading reference data and input concurrently ({pipeline} pool)")
+                # Import once up front so the loader threads don't serialize on the
+                # import lock. Forked workers (Linux) inherit the modules; spawned
+                # workers (Windows) import pandas again inside their load stages.
+                with timer.stage("import"):
+                    warm_up()
+                threads = executors.enter_context(ThreadPoolExecutor(max_workers=3))
+                # The template workbook can't be shipped between processes, so it always loads in a thread
+                loaders = executors.enter_context(ProcessPoolExecutor(max_workers=2)) if pipeline == "process" else threads
+                future_refs = timer.submit(loaders, "load_reference", DataLoader.load_reference_data, Config.DATABASE_CODE,
+                                           depends_on=["import"])
+                future_input = timer.submit(loaders, "load_input", DataLoader.load_input_data,
+                                            Config.FILE_INPUT, Config.SHEET_NAME, depends_on=["import"])
+                df_main = future_input.result()
+                if not dry_run:
+                    # Not alongside the input parse: both are pure-Python openpyxl work
+                    # and would only take turns on the GIL
+                    future_template = timer.submit(threads, "load_template", ExcelReporter.prepare_template,
+                                                   Config.FILE_INPUT, Config.SHEET_NAME, depends_on=["load_input"])
+                refs = future_refs.result()
+            else:
+                with timer.stage("load_reference"):
+                    refs = DataLoader.load_reference_data(Config.DATABASE_CODE)
+                with timer.stage("load_input", ["load_reference"]):
+                    df_main = DataLoader.load_input_data(Config.FILE_INPUT, Config.SHEET_NAME)
+        except Exception as e:
+            logger.critical(f"Initialization failed: {e}")
+            return False # Return failure
+
+        try:
+            writer = ResultWriter.for_format(output_format)
+            with timer.stage("validate", ["load_reference", "load_input"]):
+                df_main = run_validation(df_main, refs)
+            output_cols = Config.OUTPUT_COLS
 
+            if failures_output:
+                ResultSummary.write_failures(df_main[output_cols], failures_output)
+
+            if dry_run:
+                ResultSummary.log_summary(df_main[output_cols])
+                timer.log_report()
+                logger.info("=== Dry run complete, report generation skipped ===")
+                return True
+
+            # 7. Generate Output
+            # Save the results file
+            file_dir = os.path.dirname(Config.FILE_INPUT)
+            file_output_name = f"Location_review_{Config.SHEET_NAME}.{writer.EXTENSION}"
+            file_results = os.path.join(file_dir, file_output_name)
+            
+            with timer.stage("write_results", ["validate"]):
+                writer.write(df_main, file_results)
+                logger.info(f"Saved validation results to {file_results}")
+            
+            # Generate Final Report
+            file_base = os.path.splitext(os.path.basename(Config.FILE_INPUT))[0]
+            file_final = os.path.join(file_dir, f"{file_base}(REVIEW).xlsx")
+            
+            template = future_template.result() if future_template else None
+            with timer.stage("report", ["write_results", "load_template"]):
+                ExcelReporter.generate_excel_report(Config.FILE_INPUT, Config.SHEET_NAME, file_final, df_main,
+                                                    template=template)
+            timer.log_report()
+            logger.info("=== Processing Complete Successfully ===")
+            return True # Return success
+
+        except Exception as e:
+            logger.error(f"An error occurred during processing: {e}")
+            return False
+
+def compare_results(file_old, file_new, diff_output=None):
+    """
+    Diffs two results files (any RESULT_WRITERS format, e.g. Location_review_*.xlsx).
+
+    Logs a summary and, if diff_output is given, writes the full diff table there.
+    """
+    logger.info(f"=== Comparing {file_old} -> {file_new} ===")
+    try:
+        df_old = ResultWriter.for_path(file_old).read(file_old)
+        df_new = ResultWriter.for_path(file_new).read(file_new)
+        df_diff = ResultDiff.diff(df_old, df_new)
+        ResultDiff.log_summary(df_diff)
+        if diff_output:
+            ResultDiff.write(df_diff, diff_output)
+        return True
     except Exception as e:
-        logger.error(f"An error occurred during processing: {e}")
+        logger.error(f"An error occurred while comparing results: {e}")
         return False
 
+def parse_args(argv=None):
+    """Parses command line arguments; unset values fall back to Config."""
+    parser = argparse.ArgumentParser(description="Validate MxLoader LOCATION templates.")
+    parser.add_argument("--sheet", dest="sheet_name", help=f"Sheet to validate (default: {Config.SHEET_NAME})")
+    parser.add_argument("--input", dest="file_input", help="Path to the input .xlsm/.xlsx template")
+    parser.add_argument("--db", dest="database_code", help="Path to Database_Code.xlsx")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only validate and print per-status counts; skip the Excel outputs")
+    parser.add_argument("--failures", dest="failures_output", metavar="PATH",
+                        help="Write the failing rows to PATH (.xlsx, .csv, .jsonl or .parquet)")
+    parser.add_argument("--format", dest="output_format", default="xlsx", choices=sorted(RESULT_WRITERS),
+                        help="Format of the Location_review_<sheet> results file (default: xlsx)")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"),
+                        help="Compare two results files instead of running a validation")
+    parser.add_argument("--diff-output", metavar="PATH",
+                        help="With --diff, write the differences to PATH (.xlsx, .csv, .jsonl or .parquet)")
+    parser.add_argument("--pipeline", choices=[p for p in PIPELINES if p],
+                        help="Load the reference data, input and report template concurrently in a thread or process pool")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = vars(parse_args())
+    diff_files = args.pop("diff")
+    diff_output = args.pop("diff_output")
+    if diff_files:
+        sys.exit(0 if compare_results(*diff_files, diff_output=diff_output) else 1)
+    sys.exit(0 if main(**args) else 1)
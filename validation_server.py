@@ -0,0 +1,221 @@
+"""
+Local validation service.
+
+Keeps the reference tables loaded in a warm process and validates LOCATION
+batches over HTTP/JSON, so scripts (e.g. MxLoader tooling) don't pay the
+import and Database_Code.xlsx load cost on every call.
+
+Endpoints:
+    POST /validate               JSON body {"rows": [{"LOCATION": ..., "DESCRIPTION": ...,
+                                 "EGCOSTCENTER": ..., "EGBA": ..., "LOCHIERARCHY.PARENT": ...}]}
+    POST /validate?sheet=LTK-H   Raw .xlsx/.xlsm workbook body (same layout as the GUI input)
+    GET  /metrics                Request, row and latency counters as JSON
+    GET  /health                 Liveness check
+
+Usage:
+    python validation_server.py --db Database_Code.xlsx [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import io
+import json
+import logging
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import location_validator
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 50 * 1024 * 1024
+LATENCY_WINDOW = 1000  # Number of recent requests used for latency percentiles
+
+logger = logging.getLogger("validation_server")
+
+class Metrics:
+    """Thread-safe counters served by GET /metrics."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.reference_load_ms = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self.in_flight = 0
+        self.latencies_ms = []
+
+    def begin(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def end(self, elapsed_ms, rows=0, error=False):
+        with self.lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.rows += rows
+            if error:
+                self.errors += 1
+            self.latencies_ms.append(elapsed_ms)
+            del self.latencies_ms[:-LATENCY_WINDOW]
+
+    def snapshot(self):
+        with self.lock:
+            latencies = sorted(self.latencies_ms)
+            snapshot = {
+                "uptime_s": round(time.time() - self.started, 1),
+                "reference_load_ms": round(self.reference_load_ms, 1),
+                "requests": self.requests,
+                "errors": self.errors,
+                "rows_validated": self.rows,
+                "in_flight": self.in_flight,
+            }
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2) if latencies else None
+
+        snapshot["latency_ms"] = {"p50": percentile(0.50), "p95": percentile(0.95), "max": percentile(1.0)}
+        return snapshot
+
+class ValidationService:
+    """Holds the resident reference data and runs validations against it."""
+
+    def __init__(self, database_code):
+        self.database_code = database_code
+        self.metrics = Metrics()
+
+        start = time.perf_counter()
+        location_validator.warm_up()
+        refs = location_validator.DataLoader.load_reference_data(database_code)
+        # Split the plant name lists once instead of on every request
+        refs['cost'] = location_validator.DataLoader.prepare_cost_reference(refs['cost'])
+        self.refs = refs
+        self.metrics.reference_load_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Reference data loaded in {self.metrics.reference_load_ms:.0f} ms")
+
+    def validate_records(self, records):
+        df = location_validator.DataLoader.input_from_records(records)
+        return self.validate_frame(df)
+
+    def validate_workbook(self, data, sheet_name):
+        try:
+            df = location_validator.DataLoader.load_input_data(io.BytesIO(data), sheet_name)
+        except zipfile.BadZipFile as e:
+            raise ValueError("Request body is not an .xlsx/.xlsm workbook") from e
+        except KeyError as e:
+            # openpyxl raises KeyError for a sheet the workbook doesn't have
+            raise ValueError(f"Workbook has no sheet '{sheet_name}'") from e
+        return self.validate_frame(df)
+
+    def validate_frame(self, df):
+        if df.empty:
+            raise ValueError("No rows to validate")
+        df = location_validator.run_validation(df, self.refs)
+        df_out = df[location_validator.Config.OUTPUT_COLS]
+        return {
+            "rows": json.loads(df_out.to_json(orient="records", force_ascii=False)),
+            "summary": location_validator.ResultSummary.status_counts(df_out),
+        }
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the ValidationService attached to the server."""
+
+    server_version = "LocationValidator/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self.send_json(200, self.service.metrics.snapshot())
+        elif path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/validate":
+            self.send_json(404, {"error": f"Unknown endpoint {url.path}"})
+            return
+
+        self.service.metrics.begin()
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError("Invalid Content-Length")
+            if length > MAX_BODY_BYTES:
+                raise ValueError(f"Request body larger than {MAX_BODY_BYTES} bytes")
+            body = self.rfile.read(length)
+
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+            if content_type == "application/json":
+                payload = json.loads(body)
+                records = payload.get("rows") if isinstance(payload, dict) else payload
+                if not isinstance(records, list):
+                    raise ValueError('Expected {"rows": [...]} or a JSON list of rows')
+                result = self.service.validate_records(records)
+            else:
+                sheet_name = parse_qs(url.query).get("sheet", [location_validator.Config.SHEET_NAME])[0]
+                result = self.service.validate_workbook(body, sheet_name)
+            status = 200
+        except ValueError as e:
+            status, result = 400, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Validation request failed: {e}")
+            status, result = 500, {"error": str(e)}
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.service.metrics.end(elapsed_ms, rows=len(result.get("rows", [])), error=status != 200)
+        if status == 200:
+            result["elapsed_ms"] = round(elapsed_ms, 2)
+        self.send_json(status, result)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+def create_server(database_code, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Loads the reference data and returns a ready (not yet serving) HTTP server."""
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.service = ValidationService(database_code)
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve location validations over HTTP/JSON.")
+    parser.add_argument("--db", dest="database_code", default=location_validator.Config.DATABASE_CODE,
+                        help="Path to Database_Code.xlsx")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="Log every validation step and request")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    # The per-step messages of location_validator are noise at request rate
+    logging.getLogger("location_validator").setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    server = create_server(args.database_code, args.host, args.port)
+    logger.info(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()